@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the knowledge-base build and clipboard validation.
+
+Generates synthetic event sheets and clipboard payloads at configurable
+sizes, times each stage of build_project_analysis.py (discover, extract,
+extract with the streaming parser, merge, sort/group, write in several
+output formats) and C3ClipboardValidator.validate, and writes a stable
+JSON report that can be diffed or compared between commits.
+
+Usage:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --events 10,1000,100000 --depth 4 --output bench.json
+    python scripts/benchmark.py --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import build_project_analysis as bpa
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+VALIDATOR_DIR = SCRIPT_DIR.parent / ".claude" / "skills" / "construct3-copilot" / "scripts"
+REPORT_VERSION = 1
+
+# Sentinel for an exhausted container iterator in dumps_deep
+_END = object()
+
+# (objectClass, behaviorType, id, parameters) drawn from common real-world usage
+CONDITION_POOL = [
+    ("System", "", "every-tick", {}),
+    ("System", "", "on-start-of-layout", {}),
+    ("System", "", "compare-eventvar", {"variable": "Score", "comparison": 4, "value": "10"}),
+    ("Keyboard", "", "key-is-down", {"key": 87}),
+    ("Keyboard", "", "on-key-pressed", {"key": 32}),
+    ("Player", "Platform", "is-on-floor", {}),
+    ("Enemy", "", "on-collision-with-another-object", {"object": "Player"}),
+    ("Mouse", "", "on-click", {"mouse-button": "left", "click-type": "clicked"}),
+]
+ACTION_POOL = [
+    ("System", "", "set-eventvar-value", {"variable": "Score", "value": "Score + 1"}),
+    ("System", "", "create-object", {"object-to-create": "Bullet", "layer": "0",
+                                     "x": "Player.X", "y": "Player.Y"}),
+    ("System", "", "wait", {"seconds": "0.5"}),
+    ("Audio", "", "play", {"audio-file": "hit", "loop": "not-looping", "volume": "0"}),
+    ("Player", "8Direction", "simulate-control", {"control": "up"}),
+    ("Player", "", "set-animation", {"animation": "\"Run\"", "from": "beginning"}),
+    ("Enemy", "", "destroy", {}),
+    ("Text", "", "set-text", {"text": "\"Score: \" & Score"}),
+]
+
+
+def make_ace(pool: list, rng: random.Random, salt: int) -> dict:
+    obj_class, behavior, ace_id, params = rng.choice(pool)
+    ace = {"id": ace_id, "objectClass": obj_class}
+    if behavior:
+        ace["behaviorType"] = behavior
+    if params:
+        ace["parameters"] = {k: (f"{v}{salt % 7}" if isinstance(v, str) else v)
+                             for k, v in params.items()}
+    else:
+        ace["parameters"] = {}
+    return ace
+
+
+def generate_events(count: int, depth: int, seed: int = 0) -> List[dict]:
+    """Generate count event blocks, nested up to depth levels deep."""
+    rng = random.Random(seed)
+    events = []
+    made = 0
+    while made < count:
+        # Build one top-level event with a chain of nested children
+        levels = min(depth, count - made)
+        parent = None
+        for level in range(levels):
+            event = {
+                "eventType": "block",
+                "conditions": [make_ace(CONDITION_POOL, rng, made) for _ in range(rng.randint(1, 2))],
+                "actions": [make_ace(ACTION_POOL, rng, made) for _ in range(rng.randint(1, 3))],
+                "sid": rng.randrange(10 ** 14, 10 ** 15),
+            }
+            made += 1
+            if parent is None:
+                events.append(event)
+            else:
+                parent["children"] = [event]
+            parent = event
+    return events
+
+
+def generate_event_sheet(count: int, depth: int, seed: int = 0) -> dict:
+    """Synthetic eventSheets/*.json file as saved by Construct."""
+    return {"name": f"Sheet {seed}", "events": generate_events(count, depth, seed), "sid": seed}
+
+
+def generate_clipboard(count: int, depth: int, seed: int = 0) -> dict:
+    """Synthetic events clipboard payload."""
+    return {"is-c3-clipboard-data": True, "type": "events",
+            "items": generate_events(count, depth, seed)}
+
+
+def dumps_deep(value: Any, indent: Optional[str] = None) -> str:
+    """json.dumps() output built with an explicit stack.
+
+    Synthetic sheets can nest deeper than the recursion limit, which
+    json.dumps cannot serialize.
+    """
+    item_sep = ", " if indent is None else ","
+    out = []
+    # Frame: [items iterator, is dict, closing bracket, level, seen any item]
+    stack = []
+
+    def newline(level: int) -> str:
+        return "" if indent is None else "\n" + indent * level
+
+    def emit(item: Any, level: int):
+        if isinstance(item, (dict, list)) and item:
+            is_dict = isinstance(item, dict)
+            out.append("{" if is_dict else "[")
+            stack.append([iter(item.items() if is_dict else item), is_dict,
+                          "}" if is_dict else "]", level + 1, False])
+        else:
+            out.append(json.dumps(item))
+
+    emit(value, 0)
+    while stack:
+        frame = stack[-1]
+        items, is_dict, closer, level, seen = frame
+        item = next(items, _END)
+        if item is _END:
+            stack.pop()
+            out.append(newline(level - 1) + closer)
+            continue
+
+        out.append((item_sep if seen else "") + newline(level))
+        frame[4] = True
+        if is_dict:
+            key, item = item
+            out.append(json.dumps(key) + ": ")
+        emit(item, level)
+    return "".join(out)
+
+
+def write_projects(root: Path, total_events: int, depth: int, sheet_events: int) -> int:
+    """Write synthetic projects under root; returns total bytes written."""
+    size = 0
+    remaining, n = total_events, 0
+    while remaining > 0:
+        count = min(sheet_events, remaining)
+        sheets = root / f"project-{n // 4}" / "eventSheets"
+        sheets.mkdir(parents=True, exist_ok=True)
+        text = dumps_deep(generate_event_sheet(count, depth, n), indent="\t")
+        (sheets / f"sheet-{n % 4}.json").write_text(text, encoding="utf-8")
+        size += len(text.encode("utf-8"))
+        remaining -= count
+        n += 1
+    return size
+
+
+def time_runs(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Run fn repeat times (stdout silenced) and summarize wall time in seconds."""
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - start)
+    return {"min": round(min(runs), 6), "median": round(statistics.median(runs), 6)}
+
+
+def bench_build(total_events: int, depth: int, sheet_events: int, repeat: int, jobs: int) -> dict:
+    """Time each build_project_analysis.py stage on a synthetic corpus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = Path(tmp) / "projects"
+        out = Path(tmp) / "out"
+        out.mkdir()
+        size = write_projects(projects, total_events, depth, sheet_events)
+
+        sheets = sorted(bpa.find_event_sheets(projects))
+        partials = [bpa.scan_event_sheet(path) for path in sheets]
+
+        def merge():
+            aces = bpa.new_aces()
+            for partial in partials:
+                bpa.merge_aces(aces, partial, bpa.COOCCURRENCE_CAPACITY)
+            return aces
+
+        aces = merge()
+        outputs = bpa.build_outputs(aces, projects, len(sheets), len(sheets))
+
+        stages = {
+            "discover": time_runs(lambda: bpa.find_event_sheets(projects), repeat),
+            "extract": time_runs(lambda: list(bpa.scan_partials(sheets, jobs)), repeat),
+            "extract_stream": time_runs(lambda: list(bpa.scan_partials(sheets, jobs, True)), repeat),
+            "merge": time_runs(merge, repeat),
+            "sort_group": time_runs(
+                lambda: bpa.build_outputs(aces, projects, len(sheets), len(sheets)), repeat),
+            "write": time_runs(lambda: bpa.write_outputs(out, outputs), repeat),
+            "write_pretty": time_runs(lambda: bpa.write_outputs(out, outputs, "pretty"), repeat),
+            "write_columnar_gzip": time_runs(
+                lambda: bpa.write_outputs(out, outputs, "columnar", "gzip"), repeat),
+        }
+
+    extract = stages["extract"]["median"]
+    return {
+        "events": total_events,
+        "depth": depth,
+        "sheets": len(sheets),
+        "bytes": size,
+        "stages": stages,
+        "extract_events_per_sec": round(total_events / extract) if extract else None,
+        "extract_mb_per_sec": round(size / extract / (1 << 20), 3) if extract else None,
+    }
+
+
+def load_validator():
+    """C3ClipboardValidator class, or None if the validator is not available."""
+    sys.path.insert(0, str(VALIDATOR_DIR))
+    try:
+        from validate_output import C3ClipboardValidator
+    except ImportError:
+        return None
+    return C3ClipboardValidator
+
+
+def bench_validator(validator_cls, events: int, depth: int, repeat: int) -> dict:
+    """Time C3ClipboardValidator construction and validate() on one payload.
+
+    A payload too deeply nested for the validator is reported as an error
+    instead of timed.
+    """
+    payload = generate_clipboard(events, depth, seed=events)
+    validator = validator_cls()
+
+    def validate():
+        validator.errors = []
+        validator.warnings = []
+        validator.validate(payload)
+
+    result = {
+        "events": events,
+        "depth": depth,
+        "bytes": len(dumps_deep(payload).encode("utf-8")),
+    }
+    try:
+        validate()
+    except RecursionError:
+        result["error"] = "RecursionError"
+        return result
+    result["construct"] = time_runs(validator_cls, repeat)
+    result["validate"] = time_runs(validate, repeat)
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def flatten(report: dict) -> Dict[str, float]:
+    """Median timings keyed by a stable metric name, for comparisons."""
+    metrics = {}
+    for result in report["build"]:
+        for stage, timing in result["stages"].items():
+            metrics[f"build/{result['events']}/{stage}"] = timing["median"]
+    for result in report["validator"].get("results", []):
+        if "validate" in result:
+            metrics[f"validator/{result['events']}/validate"] = result["validate"]["median"]
+    return metrics
+
+
+def compare(report: dict, baseline: dict):
+    """Print the change in median timings against a baseline report."""
+    current, previous = flatten(report), flatten(baseline)
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'}:")
+    for name in sorted(current.keys() & previous.keys()):
+        before, after = previous[name], current[name]
+        change = (after - before) / before * 100 if before else 0.0
+        marker = "⚠️ " if change > 10 else "   "
+        print(f"{marker}{name}: {before * 1000:.2f} ms → {after * 1000:.2f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indexer and the clipboard validator.")
+    parser.add_argument("--events", default="10,1000,10000",
+                        help="Comma-separated total event counts (default: 10,1000,10000)")
+    parser.add_argument("--depth", type=int, default=3, help="Nesting depth of events (default: 3)")
+    parser.add_argument("--sheet-events", type=int, default=1000,
+                        help="Max events per synthetic event sheet (default: 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Worker processes for the extract stage (default: 1)")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.events.split(",") if n.strip()]
+
+    report = {
+        "version": REPORT_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"events": sizes, "depth": args.depth, "sheet_events": args.sheet_events,
+                   "repeat": args.repeat, "jobs": args.jobs},
+        "build": [],
+        "validator": {},
+    }
+
+    for events in sizes:
+        print(f"⏱️  Build: {events} events...", file=sys.stderr)
+        report["build"].append(bench_build(events, args.depth, args.sheet_events, args.repeat, args.jobs))
+
+    validator_cls = load_validator()
+    if validator_cls is None:
+        report["validator"] = {"skipped": f"validate_output.py not found in {VALIDATOR_DIR}"}
+    else:
+        results = []
+        for events in sizes:
+            print(f"⏱️  Validator: {events} events...", file=sys.stderr)
+            results.append(bench_validator(validator_cls, events, args.depth, args.repeat))
+        report["validator"] = {"results": results}
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"📁 Output: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
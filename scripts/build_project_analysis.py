@@ -7,6 +7,19 @@ a knowledge base for RAG-style retrieval.
 
 Usage:
     python scripts/build_project_analysis.py /path/to/Construct-Example-Projects
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --jobs 8
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --rebuild
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --examples 5 --example-bytes 4096
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --format columnar --compress gzip
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --format pretty   # debug
+    python scripts/build_project_analysis.py /path/to/Construct-Example-Projects --trace build-trace.json
+
+Knowledge files are written as minified JSON by default; see knowledge_io.py
+for the other layouts and compressions, and use its load_knowledge() to read
+any of them.
+
+Reruns only re-parse event sheets that changed since the last build; the
+per-sheet results are cached in build_manifest.json next to the output.
 
 Output:
     data/project_analysis/
@@ -14,79 +27,524 @@ Output:
     ├── conditions_knowledge.json   # Condition usage stats + examples
     ├── behaviors_knowledge.json    # Behavior patterns
     ├── plugins_knowledge.json      # Plugin patterns
-    └── index.json                  # Summary statistics
+    ├── cooccurrence_knowledge.json # Top-K condition→action and parent→child pairs
+    ├── index.json                  # Summary statistics
+    ├── knowledge.db                # Indexed SQLite store (see knowledge_store.py)
+    └── build_manifest.json         # Per-sheet cache for incremental rebuilds
 """
 
+import argparse
+import bisect
+import hashlib
+import heapq
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, TextIO, Tuple
+
+from fsutil import atomic_write
+from instrumentation import SLOWEST_FILES, TRACER, trace_target
+from json_stream import JSONTokenReader
+from knowledge_io import COMPRESSIONS, HAS_ZSTD, LAYOUTS, dump_knowledge
+from knowledge_store import STORE_FILE, write_store
+
+MAX_PARAM_EXAMPLES = 3
+MAX_EXAMPLE_BYTES = 2048
+SAMPLING_MODES = ("diverse", "first")
+MANIFEST_VERSION = 4
+STREAM_THRESHOLD_BYTES = 32 << 20
+MANIFEST_FILE = "build_manifest.json"
+
+# Co-occurrence relations: condition→action within one event, and parent
+# condition→child condition across one level of sub-events. Per-sheet
+# partials (and so the manifest) and the merged index each keep at most
+# COOCCURRENCE_CAPACITY counters per ACE; the top COOCCURRENCE_TOP_K are
+# output.
+COOCCURRENCE_RELATIONS = ("cond_action", "parent_child")
+COOCCURRENCE_TOP_K = 10
+COOCCURRENCE_CAPACITY = 50
+
+# (container role, key) -> role of the array value to walk when streaming
+STREAM_CHILD_ROLES = {
+    ("sheet", "events"): "events",
+    ("event", "conditions"): "conditions",
+    ("event", "actions"): "actions",
+    ("event", "children"): "events",
+}
+
+# Sentinel for an exhausted children iterator
+_DONE = object()
+
+# param_examples sampling, set by configure_sampling() in the main process
+# and in every worker. "first" keeps the first max_examples seen; "diverse"
+# dedupes by content hash and samples across projects (see record_ace).
+SAMPLING = {
+    "mode": "diverse",
+    "max_examples": MAX_PARAM_EXAMPLES,
+    "max_bytes": MAX_EXAMPLE_BYTES,
+}
+
+def configure_sampling(mode: str, max_examples: int, max_bytes: int):
+    """Set the param_examples sampling used by record_ace and merge_aces."""
+    SAMPLING.update(mode=mode, max_examples=max_examples, max_bytes=max_bytes)
+
+def canonical_params(params: dict) -> str:
+    """Stable JSON text of a parameters dict, used for hashing and sizing."""
+    return json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+def sample_priority(*parts: str) -> str:
+    """Deterministic pseudo-random priority; lower values are kept first."""
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def add_param_sample(samples: List[list], digest: str, params: dict, limit: int):
+    """Keep the limit lowest-digest distinct [digest, params] pairs, sorted."""
+    if any(d == digest for d, _ in samples):
+        return
+    bisect.insort(samples, [digest, params])
+    del samples[limit:]
+
+def merge_param_samples(target: dict, incoming: dict, key: str):
+    """Merge per-project samples, keeping max_examples projects by priority.
+
+    This is bottom-k sampling: every distinct example and every project has
+    a fixed hash priority, so the result is a uniform sample that does not
+    depend on walk or merge order.
+    """
+    limit = SAMPLING["max_examples"]
+    for project, samples in incoming.items():
+        merged = list(target.get(project, []))
+        for digest, params in samples:
+            add_param_sample(merged, digest, params, limit)
+        target[project] = merged
+
+    if len(target) > limit:
+        keep = sorted(target, key=lambda p: sample_priority(key, p))[:limit]
+        for project in list(target):
+            if project not in keep:
+                del target[project]
+
+def select_param_examples(key: str, entry: dict) -> List[dict]:
+    """Final param_examples for an ACE entry.
+
+    In "diverse" mode, takes examples round-robin across the sampled
+    projects (in priority order) until max_examples are chosen, skipping
+    any that would push the total over max_bytes.
+    """
+    samples = entry.get("param_samples")
+    if samples is None:
+        return entry["param_examples"]
+
+    queues = [samples[p] for p in sorted(samples, key=lambda p: sample_priority(key, p))]
+    chosen, seen = [], set()
+    budget = SAMPLING["max_bytes"]
+    for depth in range(SAMPLING["max_examples"]):
+        for queue in queues:
+            if depth >= len(queue) or len(chosen) >= SAMPLING["max_examples"]:
+                continue
+            digest, params = queue[depth]
+            size = len(canonical_params(params).encode("utf-8"))
+            if digest in seen or size > budget:
+                continue
+            seen.add(digest)
+            chosen.append(params)
+            budget -= size
+    return chosen
+
+def finalize_aces(table: dict) -> dict:
+    """Replace sampling state with the selected param_examples."""
+    return {
+        key: {k: v for k, v in data.items() if k != "param_samples"}
+        | {"param_examples": select_param_examples(key, data)}
+        for key, data in table.items()
+    }
 
 def find_event_sheets(root: Path) -> List[Path]:
     """Find all eventSheets/*.json files."""
     return list(root.rglob("eventSheets/*.json"))
 
-def extract_aces_from_event(event: dict, aces: dict):
-    """Recursively extract ACEs from an event block."""
-    # Extract conditions
-    for cond in event.get("conditions", []):
-        ace_id = cond.get("id", "")
-        obj_class = cond.get("objectClass", "")
-        params = cond.get("parameters", {})
-        behavior = cond.get("behaviorType", "")
-
-        if ace_id:
-            key = f"{obj_class}:{ace_id}" if obj_class else ace_id
-            if key not in aces["conditions"]:
-                aces["conditions"][key] = {
-                    "id": ace_id,
-                    "objectClass": obj_class,
-                    "behaviorType": behavior,
-                    "usage_count": 0,
-                    "param_examples": []
-                }
-            aces["conditions"][key]["usage_count"] += 1
-            if params and len(aces["conditions"][key]["param_examples"]) < 3:
-                aces["conditions"][key]["param_examples"].append(params)
-
-    # Extract actions
-    for action in event.get("actions", []):
-        ace_id = action.get("id", "")
-        obj_class = action.get("objectClass", "")
-        params = action.get("parameters", {})
-        behavior = action.get("behaviorType", "")
-
-        if ace_id:
-            key = f"{obj_class}:{ace_id}" if obj_class else ace_id
-            if key not in aces["actions"]:
-                aces["actions"][key] = {
-                    "id": ace_id,
-                    "objectClass": obj_class,
-                    "behaviorType": behavior,
-                    "usage_count": 0,
-                    "param_examples": []
-                }
-            aces["actions"][key]["usage_count"] += 1
-            if params and len(aces["actions"][key]["param_examples"]) < 3:
-                aces["actions"][key]["param_examples"].append(params)
-
-    # Recurse into children
-    for child in event.get("children", []):
-        extract_aces_from_event(child, aces)
-
-def process_event_sheet(path: Path, aces: dict, project_name: str):
-    """Process a single event sheet file."""
+def record_ace(table: dict, ace: dict, project: str = "") -> str:
+    """Count one condition or action into its ACE table and return its key."""
+    ace_id = ace.get("id", "")
+    obj_class = ace.get("objectClass", "")
+    params = ace.get("parameters", {})
+    behavior = ace.get("behaviorType", "")
+
+    if ace_id:
+        key = f"{obj_class}:{ace_id}" if obj_class else ace_id
+        if key not in table:
+            table[key] = {
+                "id": ace_id,
+                "objectClass": obj_class,
+                "behaviorType": behavior,
+                "usage_count": 0,
+                "param_examples": []
+            }
+            if SAMPLING["mode"] == "diverse":
+                table[key]["param_samples"] = {}
+        entry = table[key]
+        entry["usage_count"] += 1
+        if params:
+            if SAMPLING["mode"] == "first":
+                if len(entry["param_examples"]) < SAMPLING["max_examples"]:
+                    entry["param_examples"].append(params)
+            else:
+                digest = sample_priority(canonical_params(params))
+                add_param_sample(entry["param_samples"].setdefault(project, []),
+                                 digest, params, SAMPLING["max_examples"])
+        return key
+    return ""
+
+def count_pairs(relation: dict, sources: List[str], targets: List[str]):
+    """Count every source→target pair into a co-occurrence relation."""
+    for source in sources:
+        counts = relation.setdefault(source, {})
+        for target in targets:
+            counts[target] = counts.get(target, 0) + 1
+
+def record_event_pairs(aces: dict, cond_keys: List[str], action_keys: List[str],
+                       child_cond_keys: List[str]):
+    """Record an event's co-occurrence pairs once its children are done."""
+    pairs = aces["cooccurrence"]
+    count_pairs(pairs["cond_action"], cond_keys, action_keys)
+    count_pairs(pairs["parent_child"], cond_keys, child_cond_keys)
+
+def extract_aces_from_event(event: dict, aces: dict, project: str = "") -> List[str]:
+    """Extract ACEs from an event block and all of its sub-events.
+
+    Sub-events are walked with an explicit stack, so nesting depth is not
+    limited by the recursion limit. ACEs are recorded in the same order as
+    a depth-first walk. Returns the event's condition keys so the caller
+    can pair them with its own.
+    """
+    def enter(block: dict) -> list:
+        cond_keys = [record_ace(aces["conditions"], cond, project) for cond in block.get("conditions", [])]
+        action_keys = [record_ace(aces["actions"], action, project) for action in block.get("actions", [])]
+        # Frame: [condition keys, action keys, children's condition keys, remaining children]
+        return [cond_keys, action_keys, [], iter(block.get("children", []))]
+
+    stack = [enter(event)]
+    while True:
+        cond_keys, action_keys, child_cond_keys, children = stack[-1]
+        child = next(children, _DONE)
+        if child is not _DONE:
+            stack.append(enter(child))
+            continue
+
+        # All children done: record this event's pairs and report to the parent
+        stack.pop()
+        cond_keys = [k for k in cond_keys if k]
+        record_event_pairs(aces, cond_keys, [k for k in action_keys if k], child_cond_keys)
+        if not stack:
+            return cond_keys
+        stack[-1][2].extend(cond_keys)
+
+def stream_aces_from_sheet(f: TextIO, aces: dict, project: str = ""):
+    """Extract ACEs from an event sheet stream without loading it whole.
+
+    Walks events/conditions/actions/children with an explicit stack and
+    skips every other value, so memory stays flat and nesting depth is
+    unlimited. Only individual conditions and actions are materialized.
+    Counts and co-occurrence pairs match extract_aces_from_event;
+    param_examples order matches too as long as each event lists children
+    after its conditions and actions, which is how Construct writes sheets.
+    """
+    reader = JSONTokenReader(f)
+    token = reader.next_token()
+    if token[0] != "{":
+        reader.skip_value(token)
+        return
+
+    # Each frame: [role, seen any member]. Maps are "sheet" and "event";
+    # arrays are "events" and the ACE tables "conditions"/"actions". Event
+    # frames also collect [condition keys, action keys, child condition keys]
+    # for co-occurrence pairs.
+    stack = [["sheet", False]]
+    while stack:
+        frame = stack[-1]
+        role, seen = frame[:2]
+        token = reader.next_member(seen)
+        frame[1] = True
+
+        if token[0] in "}]":
+            stack.pop()
+            if role == "event":
+                _, _, cond_keys, action_keys, child_cond_keys = frame
+                record_event_pairs(aces, cond_keys, action_keys, child_cond_keys)
+                # stack[-1] is the enclosing "events" array; its owner may be an event
+                if len(stack) > 1 and stack[-2][0] == "event":
+                    stack[-2][4].extend(cond_keys)
+            continue
+
+        if role in ("sheet", "event"):
+            key = reader.read_key(token)
+            token = reader.next_token()
+            child_role = STREAM_CHILD_ROLES.get((role, key))
+            if child_role and token[0] == "[":
+                stack.append([child_role, False])
+            else:
+                reader.skip_value(token)
+        elif role == "events":
+            if token[0] == "{":
+                stack.append(["event", False, [], [], []])
+            else:
+                reader.skip_value(token)
+        else:
+            ace = reader.read_value(token)
+            if isinstance(ace, dict):
+                key = record_ace(aces[role], ace, project)
+                if key:
+                    # stack[-2] is the event owning this ACE array
+                    stack[-2][2 if role == "conditions" else 3].append(key)
+
+def process_event_sheet(path: Path, aces: dict, project_name: str, stream: bool = False,
+                        timings: Optional[dict] = None):
+    """Process a single event sheet file.
+
+    Sheets larger than STREAM_THRESHOLD_BYTES, or too deeply nested for
+    json.load, are read with the streaming parser instead. If timings is
+    given, parse and extract times (ns) are stored in it; the streaming
+    parser extracts as it parses, so its whole time counts as parse.
+    """
+    start = time.perf_counter_ns()
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
+            data = None
+            if not stream and path.stat().st_size <= STREAM_THRESHOLD_BYTES:
+                try:
+                    data = json.load(f)
+                except RecursionError:
+                    f.seek(0)
+
+            if data is None:
+                # Collect separately so a sheet that fails midway adds nothing
+                sheet_aces = new_aces()
+                stream_aces_from_sheet(f, sheet_aces, project_name)
+                merge_aces(aces, sheet_aces)
+                if timings is not None:
+                    timings.update(parse=time.perf_counter_ns() - start, extract=0, streamed=True)
+                return
+
+        parsed = time.perf_counter_ns()
         for event in data.get("events", []):
-            extract_aces_from_event(event, aces)
+            extract_aces_from_event(event, aces, project_name)
+        if timings is not None:
+            timings.update(parse=parsed - start, extract=time.perf_counter_ns() - parsed,
+                           streamed=False)
 
     except (json.JSONDecodeError, KeyError) as e:
         print(f"  ⚠️ Error processing {path}: {e}")
 
+def new_aces() -> dict:
+    """Create an empty ACE table."""
+    return {
+        "conditions": {},
+        "actions": {},
+        "cooccurrence": {relation: {} for relation in COOCCURRENCE_RELATIONS}
+    }
+
+def scan_event_sheet(path: Path, stream: bool = False) -> dict:
+    """Extract a partial ACE table from a single event sheet.
+
+    Runs in worker processes when --jobs > 1, so it must stay importable
+    and only return picklable data.
+    """
+    aces = new_aces()
+    process_event_sheet(path, aces, path.parent.parent.name, stream)
+    return bound_cooccurrence(aces)
+
+def scan_event_sheet_timed(path: Path, stream: bool = False) -> Tuple[dict, dict]:
+    """scan_event_sheet() plus the parse/extract timings used by --trace."""
+    timings = {"start": time.perf_counter_ns(), "pid": os.getpid()}
+    aces = new_aces()
+    process_event_sheet(path, aces, path.parent.parent.name, stream, timings)
+    return bound_cooccurrence(aces), timings
+
+def bound_cooccurrence(aces: dict, capacity: int = COOCCURRENCE_CAPACITY) -> dict:
+    """Keep at most capacity co-occurrence counters per ACE in a sheet's table.
+
+    Keeps the largest counts (ties broken by first-seen order) in their
+    original order, so partials held during the scan and cached in the
+    manifest stay bounded no matter how large a sheet is. Counts dropped
+    here are lost, so a partner that is rare in every sheet but common
+    overall can be undercounted; heavy hitters are unaffected.
+    """
+    for relation in aces["cooccurrence"].values():
+        for source, counts in relation.items():
+            if len(counts) > capacity:
+                keep = set(heapq.nsmallest(capacity, counts, key=lambda t: -counts[t]))
+                relation[source] = {t: n for t, n in counts.items() if t in keep}
+    return aces
+
+def record_sheet_timings(path: Path, timings: dict):
+    # project/eventSheets/name.json keeps traces comparable across machines
+    if "parse" in timings:
+        TRACER.record_file("/".join(path.parts[-3:]), timings["start"],
+                           {"parse": timings["parse"], "extract": timings["extract"]},
+                           tid=timings["pid"], bytes=path.stat().st_size,
+                           streamed=timings["streamed"])
+
+def merge_counts(target: dict, counts: dict, capacity: int = None):
+    """Add weighted counts into target, keeping at most capacity counters.
+
+    Uses the Space-Saving algorithm: a new item that finds target full
+    replaces the smallest counter and inherits its count, so heavy hitters
+    survive and their counts are overestimated by at most that minimum.
+    """
+    for item, count in counts.items():
+        if item in target or capacity is None or len(target) < capacity:
+            target[item] = target.get(item, 0) + count
+        else:
+            victim = min(target, key=target.get)
+            target[item] = target.pop(victim) + count
+
+def merge_aces(aces: dict, partial: dict, pair_capacity: int = None):
+    """Merge a partial ACE table into aces.
+
+    Partials must be merged in event sheet order: new keys keep first-seen
+    order (and, with "first" sampling, param_examples keep the first ones
+    seen), so the result is identical to a serial scan. Co-occurrence
+    counts are exact unless pair_capacity bounds the counters kept per ACE.
+    """
+    for kind in ("conditions", "actions"):
+        target = aces[kind]
+        for key, data in partial[kind].items():
+            if key not in target:
+                target[key] = {**data, "usage_count": 0, "param_examples": []}
+                if "param_samples" in data:
+                    target[key]["param_samples"] = {}
+            entry = target[key]
+            entry["usage_count"] += data["usage_count"]
+            room = SAMPLING["max_examples"] - len(entry["param_examples"])
+            if room > 0:
+                entry["param_examples"].extend(data["param_examples"][:room])
+            if "param_samples" in data:
+                merge_param_samples(entry["param_samples"], data["param_samples"], key)
+
+    for relation in COOCCURRENCE_RELATIONS:
+        target = aces["cooccurrence"][relation]
+        for source, counts in partial["cooccurrence"][relation].items():
+            merge_counts(target.setdefault(source, {}), counts, pair_capacity)
+
+def scan_partials(event_sheets: List[Path], jobs: int = 1, stream: bool = False) -> Iterator[dict]:
+    """Yield one partial ACE table per event sheet, in order.
+
+    With jobs > 1 the sheets are spread across a process pool. When
+    tracing, per-sheet timings are collected from wherever a sheet was
+    scanned.
+    """
+    scan = scan_event_sheet_timed if TRACER.enabled else scan_event_sheet
+
+    def results() -> Iterator:
+        if jobs > 1 and len(event_sheets) > 1:
+            chunksize = max(1, len(event_sheets) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs, initializer=configure_sampling,
+                                     initargs=(SAMPLING["mode"], SAMPLING["max_examples"],
+                                               SAMPLING["max_bytes"])) as executor:
+                yield from executor.map(scan, event_sheets,
+                                        [stream] * len(event_sheets), chunksize=chunksize)
+        else:
+            for es_path in event_sheets:
+                yield scan(es_path, stream)
+
+    for i, (es_path, result) in enumerate(zip(event_sheets, results())):
+        if TRACER.enabled:
+            result, timings = result
+            record_sheet_timings(es_path, timings)
+        yield result
+
+        if (i + 1) % 100 == 0:
+            print(f"  Processed {i + 1}/{len(event_sheets)} files...")
+
+def manifest_settings() -> dict:
+    """Settings that affect per-sheet partials; a change invalidates the manifest."""
+    return {
+        "version": MANIFEST_VERSION,
+        "sampling": SAMPLING["mode"],
+        "max_param_examples": SAMPLING["max_examples"],
+    }
+
+def load_manifest(path: Path) -> dict:
+    """Load the build manifest, or return an empty one if missing or stale."""
+    empty = {"settings": manifest_settings(), "sheets": {}}
+    if not path.exists():
+        return empty
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  ⚠️ Ignoring unreadable manifest {path}: {e}")
+        return empty
+
+    if manifest.get("settings") != manifest_settings():
+        print("  ♻️ Build settings changed, rebuilding all event sheets")
+        return empty
+    return manifest
+
+def save_manifest(path: Path, manifest: dict):
+    """Write the build manifest atomically."""
+    with atomic_write(path) as tmp_path, open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def scan_event_sheets(event_sheets: List[Path], projects_dir: Path, manifest: dict,
+                      jobs: int = 1, stream: bool = False) -> Tuple[dict, dict]:
+    """Scan event sheets, reusing manifest partials for unchanged files.
+
+    A sheet is reused when its mtime and size match the manifest, or failing
+    that when its content hash does. Sheets missing from event_sheets are
+    dropped from the returned manifest. Returns (aces, manifest).
+    """
+    cached = manifest["sheets"]
+    sheets = {}
+    stale = []
+
+    for es_path in event_sheets:
+        rel = es_path.relative_to(projects_dir).as_posix()
+        st = es_path.stat()
+        entry = cached.get(rel)
+
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            sheets[rel] = entry
+            continue
+
+        digest = file_digest(es_path)
+        if entry and entry["sha256"] == digest:
+            sheets[rel] = {**entry, "mtime": st.st_mtime_ns, "size": st.st_size}
+            continue
+
+        sheets[rel] = {"mtime": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "aces": None}
+        stale.append(es_path)
+
+    removed = len(cached.keys() - sheets.keys())
+    TRACER.counter("sheets", total=len(sheets), reused=len(sheets) - len(stale),
+                   parsed=len(stale), removed=removed)
+    print(f"  ♻️ Reusing {len(sheets) - len(stale)} cached, parsing {len(stale)}, "
+          f"dropping {removed} removed")
+
+    with TRACER.span("scan", sheets=len(stale), jobs=jobs):
+        for es_path, partial in zip(stale, scan_partials(stale, jobs, stream)):
+            sheets[es_path.relative_to(projects_dir).as_posix()]["aces"] = partial
+
+    # Merge in event sheet order so output matches a full serial scan
+    aces = new_aces()
+    with TRACER.span("merge"):
+        for entry in sheets.values():
+            merge_aces(aces, entry["aces"], COOCCURRENCE_CAPACITY)
+
+    return aces, {"settings": manifest_settings(), "sheets": sheets}
+
 def build_behavior_stats(aces: dict) -> dict:
     """Group ACEs by behavior type."""
     behaviors = defaultdict(lambda: {"conditions": [], "actions": [], "usage_count": 0})
@@ -123,52 +581,28 @@ def build_plugin_stats(aces: dict) -> dict:
 
     return dict(plugins)
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python build_project_analysis.py /path/to/Construct-Example-Projects")
-        sys.exit(1)
-
-    example_root = Path(sys.argv[1])
-    if not example_root.exists():
-        print(f"❌ Path not found: {example_root}")
-        sys.exit(1)
-
-    # Find example-projects subdirectory
-    projects_dir = example_root / "example-projects"
-    if not projects_dir.exists():
-        projects_dir = example_root
-
-    output_dir = Path(__file__).parent.parent / "data" / "project_analysis"
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    print(f"📂 Scanning: {projects_dir}")
-
-    # Find all event sheets
-    event_sheets = find_event_sheets(projects_dir)
-    print(f"📄 Found {len(event_sheets)} event sheets")
-
-    # Extract ACEs
+def build_cooccurrence(aces: dict, top_k: int = COOCCURRENCE_TOP_K) -> dict:
+    """Top-K neighbours per ACE for each co-occurrence relation."""
+    result = {}
+    for relation in COOCCURRENCE_RELATIONS:
+        result[relation] = {
+            source: [
+                {"key": target, "count": count}
+                for target, count in heapq.nlargest(top_k, counts.items(), key=lambda x: x[1])
+            ]
+            for source, counts in aces["cooccurrence"][relation].items()
+            if counts
+        }
+    return result
+
+def build_outputs(aces: dict, projects_dir: Path, project_count: int, sheet_count: int) -> Dict[str, Any]:
+    """Sort and group merged ACEs into the output files, keyed by file name."""
     aces = {
-        "conditions": {},
-        "actions": {}
+        **aces,
+        "conditions": finalize_aces(aces["conditions"]),
+        "actions": finalize_aces(aces["actions"])
     }
 
-    project_count = 0
-    processed_projects = set()
-
-    for i, es_path in enumerate(event_sheets):
-        project_name = es_path.parent.parent.name
-        if project_name not in processed_projects:
-            processed_projects.add(project_name)
-            project_count += 1
-
-        process_event_sheet(es_path, aces, project_name)
-
-        if (i + 1) % 100 == 0:
-            print(f"  Processed {i + 1}/{len(event_sheets)} files...")
-
-    print(f"\n✅ Processed {project_count} projects")
-
     # Sort by usage count
     actions_sorted = dict(sorted(
         aces["actions"].items(),
@@ -186,20 +620,7 @@ def main():
     behaviors = build_behavior_stats(aces)
     plugins = build_plugin_stats(aces)
 
-    # Write output files
-    with open(output_dir / "actions_knowledge.json", 'w', encoding='utf-8') as f:
-        json.dump(actions_sorted, f, indent=2, ensure_ascii=False)
-
-    with open(output_dir / "conditions_knowledge.json", 'w', encoding='utf-8') as f:
-        json.dump(conditions_sorted, f, indent=2, ensure_ascii=False)
-
-    with open(output_dir / "behaviors_knowledge.json", 'w', encoding='utf-8') as f:
-        json.dump(behaviors, f, indent=2, ensure_ascii=False)
-
-    with open(output_dir / "plugins_knowledge.json", 'w', encoding='utf-8') as f:
-        json.dump(plugins, f, indent=2, ensure_ascii=False)
-
-    # Write sorted indexes for quick "top" queries
+    # Sorted indexes for quick "top" queries
     sorted_indexes = {
         "top_50_actions": [
             {"key": k, "usage_count": v["usage_count"]} for k, v in list(actions_sorted.items())[:50]
@@ -218,14 +639,11 @@ def main():
             )[:50]
         ],
     }
-    with open(output_dir / "sorted_indexes.json", 'w', encoding='utf-8') as f:
-        json.dump(sorted_indexes, f, indent=2, ensure_ascii=False)
 
-    # Write index
     index = {
         "source": str(projects_dir),
         "project_count": project_count,
-        "event_sheet_count": len(event_sheets),
+        "event_sheet_count": sheet_count,
         "unique_actions": len(actions_sorted),
         "unique_conditions": len(conditions_sorted),
         "total_action_usage": sum(a["usage_count"] for a in actions_sorted.values()),
@@ -234,12 +652,127 @@ def main():
         "top_10_conditions": list(conditions_sorted.keys())[:10]
     }
 
-    with open(output_dir / "index.json", 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2, ensure_ascii=False)
+    return {
+        "actions_knowledge.json": actions_sorted,
+        "conditions_knowledge.json": conditions_sorted,
+        "behaviors_knowledge.json": behaviors,
+        "plugins_knowledge.json": plugins,
+        "cooccurrence_knowledge.json": build_cooccurrence(aces),
+        "sorted_indexes.json": sorted_indexes,
+        "index.json": index,
+    }
+
+def write_outputs(output_dir: Path, outputs: Dict[str, Any],
+                  layout: str = "min", compression: str = "none"):
+    """Write each output file in the given layout and compression."""
+    for name, data in outputs.items():
+        dump_knowledge(output_dir, name, data, layout, compression)
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build project analysis index from Construct 3 example projects."
+    )
+    parser.add_argument("projects_root", type=Path,
+                        help="Path to Construct-Example-Projects (or any folder of projects)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Worker processes for scanning event sheets (0 = all CPUs, default: 1)")
+    parser.add_argument("-o", "--output", type=Path,
+                        default=Path(__file__).parent.parent / "data" / "project_analysis",
+                        help="Output directory (default: data/project_analysis)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help=f"Ignore {MANIFEST_FILE} and re-parse every event sheet")
+    parser.add_argument("--sampling", choices=SAMPLING_MODES, default="diverse",
+                        help="param_examples sampling: 'diverse' dedupes and samples across "
+                             "projects, 'first' keeps the first ones seen (default: diverse)")
+    parser.add_argument("--examples", type=int, default=MAX_PARAM_EXAMPLES,
+                        help=f"param_examples kept per ACE (default: {MAX_PARAM_EXAMPLES})")
+    parser.add_argument("--example-bytes", type=int, default=MAX_EXAMPLE_BYTES,
+                        help="Cap on total param_examples JSON bytes per ACE with 'diverse' "
+                             f"sampling (default: {MAX_EXAMPLE_BYTES})")
+    parser.add_argument("--format", choices=LAYOUTS, default="min",
+                        help="Knowledge file layout: minified JSON, column-oriented with a string "
+                             "table, or indented JSON for debugging (default: min)")
+    parser.add_argument("--compress", choices=COMPRESSIONS, default="none",
+                        help="Compress knowledge files as .json.gz or .json.zst (default: none)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Use the bounded-memory streaming parser for every event sheet "
+                             f"(default: only sheets over {STREAM_THRESHOLD_BYTES >> 20} MB)")
+    parser.add_argument("--trace", type=Path,
+                        help="Write a Chrome trace of phase and per-sheet timings here "
+                             "(or set C3_TRACE)")
+    parser.add_argument("--trace-files", type=int, default=SLOWEST_FILES,
+                        help=f"Slowest event sheets to keep in the trace (default: {SLOWEST_FILES})")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    if args.compress == "zstd" and not HAS_ZSTD:
+        print("❌ --compress zstd requires the zstandard package (pip install zstandard)")
+        sys.exit(1)
+
+    example_root = args.projects_root
+    if not example_root.exists():
+        print(f"❌ Path not found: {example_root}")
+        sys.exit(1)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    configure_sampling(args.sampling, args.examples, args.example_bytes)
+
+    trace_path = trace_target(args.trace)
+    if trace_path:
+        TRACER.enable("build_project_analysis", args.trace_files)
+
+    # Find example-projects subdirectory
+    projects_dir = example_root / "example-projects"
+    if not projects_dir.exists():
+        projects_dir = example_root
+
+    output_dir = args.output
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"📂 Scanning: {projects_dir}")
+
+    # Find all event sheets
+    with TRACER.span("discover"):
+        event_sheets = sorted(find_event_sheets(projects_dir))
+    print(f"📄 Found {len(event_sheets)} event sheets")
+    if jobs > 1:
+        print(f"⚙️  Using {jobs} worker processes")
+
+    # Extract ACEs, reusing unchanged sheets from the previous run
+    manifest_path = output_dir / MANIFEST_FILE
+    if args.rebuild:
+        manifest = {"settings": manifest_settings(), "sheets": {}}
+    else:
+        with TRACER.span("manifest_load"):
+            manifest = load_manifest(manifest_path)
+
+    aces, manifest = scan_event_sheets(event_sheets, projects_dir, manifest, jobs, args.stream)
+    with TRACER.span("manifest_save"):
+        save_manifest(manifest_path, manifest)
+
+    project_count = len({es_path.parent.parent.name for es_path in event_sheets})
+
+    print(f"\n✅ Processed {project_count} projects")
+
+    with TRACER.span("sort"):
+        outputs = build_outputs(aces, projects_dir, project_count, len(event_sheets))
+    with TRACER.span("write", format=args.format, compress=args.compress):
+        write_outputs(output_dir, outputs, args.format, args.compress)
+
+    actions_sorted = outputs["actions_knowledge.json"]
+    index = outputs["index.json"]
+
+    # Write indexed store for lookups without loading the JSON files
+    with TRACER.span("write_store"):
+        write_store(output_dir / STORE_FILE, {
+            "actions": actions_sorted,
+            "conditions": outputs["conditions_knowledge.json"]
+        }, index, outputs["cooccurrence_knowledge.json"])
 
     print(f"\n📊 Statistics:")
-    print(f"   Unique actions: {len(actions_sorted)}")
-    print(f"   Unique conditions: {len(conditions_sorted)}")
+    print(f"   Unique actions: {index['unique_actions']}")
+    print(f"   Unique conditions: {index['unique_conditions']}")
     print(f"   Total action usage: {index['total_action_usage']}")
     print(f"   Total condition usage: {index['total_condition_usage']}")
     print(f"\n📁 Output: {output_dir}")
@@ -247,5 +780,9 @@ def main():
     for key in list(actions_sorted.keys())[:10]:
         print(f"   {key}: {actions_sorted[key]['usage_count']} uses")
 
+    if trace_path:
+        TRACER.save(trace_path)
+        print(f"\n📈 Trace: {trace_path}")
+
 if __name__ == "__main__":
     main()
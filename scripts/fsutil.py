@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+File helpers shared by the scripts that write caches and build outputs.
+
+Usage:
+    from fsutil import atomic_write
+    with atomic_write(path) as tmp_path:
+        tmp_path.write_bytes(data)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def atomic_write(path: Path, mode: int = 0o644) -> Iterator[Path]:
+    """Yield a fresh temp path next to path, then move it over path.
+
+    The temp file is unique per call, so concurrent writers of the same
+    path never replace each other's half-written file; the last complete
+    write wins. Readers see either the old or the new file. On error the
+    temp file is removed and path is left untouched.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, mode)  # mkstemp creates files owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
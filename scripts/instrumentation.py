@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing instrumentation for the indexer and the validator.
+
+Enabled with --trace PATH on build_project_analysis.py and preflight.py, or
+by setting C3_TRACE=PATH. Spans are written as a Chrome trace event file
+that loads in chrome://tracing, Perfetto or speedscope. Its "otherData"
+holds a key-sorted summary that diffs cleanly between runs: call count,
+total and max time per phase or check, counters, and the slowest files.
+
+When tracing is off, TRACER.span() is a no-op and nothing is written.
+
+Usage:
+    from instrumentation import TRACER
+    TRACER.enable("my_tool")
+    with TRACER.span("discover"):
+        ...
+    validator = TRACER.instrument(C3ClipboardValidator(), "check")
+    TRACER.save(Path("trace.json"))
+"""
+
+import functools
+import heapq
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+TRACE_ENV = "C3_TRACE"
+SLOWEST_FILES = 20
+
+# Spans beyond this are still totalled in the summary but not written as events
+MAX_EVENTS = 200_000
+
+
+def trace_target(path: Optional[Path]) -> Optional[Path]:
+    """The --trace path if given, else $C3_TRACE, else None (tracing off)."""
+    if path is not None:
+        return path
+    env = os.environ.get(TRACE_ENV)
+    return Path(env) if env else None
+
+
+class Tracer:
+    """Collects wall-time spans, counters and per-file timings.
+
+    Timestamps come from time.perf_counter_ns(), which is system-wide on
+    Linux and macOS, so file timings measured in worker processes line up
+    with the parent's spans.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.tool = ""
+        self.max_files = SLOWEST_FILES
+        self.origin_ns = 0
+        self.events = []
+        self.dropped = 0
+        self.totals: Dict[tuple, list] = {}  # (cat, name) -> [count, total_ns, max_ns]
+        self.counters: Dict[str, dict] = {}
+        self._files = []  # min-heap of (total_ns, seq, record) for the slowest files
+        self._seq = 0
+
+    def enable(self, tool: str, max_files: int = SLOWEST_FILES):
+        """Start a fresh trace."""
+        self.__init__()
+        self.enabled = True
+        self.tool = tool
+        self.max_files = max_files
+        self.origin_ns = time.perf_counter_ns()
+
+    def _event(self, event: dict):
+        if len(self.events) < MAX_EVENTS:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def _total(self, cat: str, name: str, dur_ns: int):
+        total = self.totals.setdefault((cat, name), [0, 0, 0])
+        total[0] += 1
+        total[1] += dur_ns
+        total[2] = max(total[2], dur_ns)
+
+    def complete(self, name: str, cat: str, start_ns: int, dur_ns: int,
+                 args: Optional[dict] = None, tid: int = 0):
+        """Record one finished span."""
+        event = {"name": name, "cat": cat, "ph": "X",
+                 "ts": (start_ns - self.origin_ns) / 1000, "dur": dur_ns / 1000,
+                 "pid": os.getpid(), "tid": tid}
+        if args:
+            event["args"] = args
+        self._event(event)
+        self._total(cat, name, dur_ns)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "phase", **args) -> Iterator[dict]:
+        """Time the with-block. Yields its args dict so results can be attached."""
+        if not self.enabled:
+            yield {}
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.complete(name, cat, start, time.perf_counter_ns() - start, args)
+
+    def counter(self, name: str, **values: int):
+        """Record counter values (last value wins in the summary)."""
+        if not self.enabled:
+            return
+        self._event({"name": name, "ph": "C", "ts": (time.perf_counter_ns() - self.origin_ns) / 1000,
+                     "pid": os.getpid(), "args": values})
+        self.counters[name] = values
+
+    def record_file(self, path: str, start_ns: int, phases: Dict[str, int],
+                    tid: int = 0, **info: Any):
+        """Add one file's per-phase times (ns) to the totals and keep the slowest files."""
+        for phase, dur_ns in phases.items():
+            self._total("file", phase, dur_ns)
+        record = {"file": path, "start_ns": start_ns, "tid": tid, "phases": phases, **info}
+        self._seq += 1
+        entry = (sum(phases.values()), self._seq, record)
+        if len(self._files) < self.max_files:
+            heapq.heappush(self._files, entry)
+        elif entry[0] > self._files[0][0]:
+            heapq.heapreplace(self._files, entry)
+
+    def _timed(self, method, name: str, cat: str):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.complete(name, cat, start, time.perf_counter_ns() - start)
+        return timed
+
+    def instrument(self, obj: Any, cat: str, skip=("validate",)) -> Any:
+        """Time every method of obj's class on this instance.
+
+        Methods are wrapped on the instance, so calls made through self
+        (e.g. each check inside C3ClipboardValidator.validate) are timed
+        without knowing the class's internals. No-op when tracing is off.
+        """
+        if not self.enabled:
+            return obj
+        for name, _ in inspect.getmembers(type(obj), inspect.isfunction):
+            if not name.startswith("__") and name not in skip:
+                setattr(obj, name, self._timed(getattr(obj, name), name, cat))
+        return obj
+
+    def slowest_files(self) -> list:
+        return [record for _, _, record in sorted(self._files, key=lambda e: (-e[0], e[1]))]
+
+    def summary(self) -> dict:
+        """Stable, diffable totals for otherData."""
+        totals = {}
+        for (cat, name), (count, total_ns, max_ns) in sorted(self.totals.items()):
+            totals.setdefault(cat, {})[name] = {
+                "count": count,
+                "total_ms": round(total_ns / 1e6, 3),
+                "max_ms": round(max_ns / 1e6, 3),
+            }
+        return {
+            "tool": self.tool,
+            "totals": totals,
+            "counters": self.counters,
+            "slowest_files": [
+                {"file": r["file"],
+                 **{f"{phase}_ms": round(ns / 1e6, 3) for phase, ns in r["phases"].items()},
+                 **{k: v for k, v in r.items() if k not in ("file", "start_ns", "tid", "phases")}}
+                for r in self.slowest_files()
+            ],
+            "dropped_events": self.dropped,
+        }
+
+    def trace_events(self) -> list:
+        """Recorded events plus one span per phase of each slowest file."""
+        events = list(self.events)
+        for record in self.slowest_files():
+            start = record["start_ns"]
+            for phase, dur_ns in record["phases"].items():
+                events.append({"name": phase, "cat": "file", "ph": "X",
+                               "ts": (start - self.origin_ns) / 1000, "dur": dur_ns / 1000,
+                               "pid": os.getpid(), "tid": record["tid"],
+                               "args": {"file": record["file"]}})
+                start += dur_ns
+        return events
+
+    def save(self, path: Path):
+        """Write the trace as Chrome trace event JSON."""
+        trace = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "otherData": self.summary(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=1, ensure_ascii=False, sort_keys=True)
+
+
+# Process-wide tracer, disabled until enable() is called
+TRACER = Tracer()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON tokenizer for reading large files with bounded memory.
+
+Reads a text stream in fixed-size chunks and yields one token at a time,
+so callers can walk the parts of a document they care about and skip the
+rest without materializing it. Nesting is tracked with explicit stacks,
+never recursion, so arbitrarily deep documents are fine.
+
+Usage:
+    with open(path, "r", encoding="utf-8") as f:
+        reader = JSONTokenReader(f)
+        kind, value = reader.next_token()
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, TextIO, Tuple
+
+NUMBER_RE = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+NUMBER_TAIL = ".eE+-"
+# Characters a string scan must stop at: its end, escapes, and invalid raw control characters
+STRING_SPECIAL_RE = re.compile(r'["\\\x00-\x1f]')
+LITERALS = {"true": True, "false": False, "null": None}
+WHITESPACE = " \t\n\r"
+PUNCTUATION = "{}[]:,"
+
+Token = Tuple[str, Any]
+
+
+class JSONTokenReader:
+    """Pull tokenizer over a text stream.
+
+    next_token() returns ("{", None), ("}", None), ("[", None), ("]", None),
+    (":", None), (",", None), ("value", <str|int|float|bool|None>) or
+    ("eof", None). Malformed input raises json.JSONDecodeError.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = 0):
+        chunk = self.stream.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def _string_end(self, keep: bool = True) -> int:
+        """Index just past the closing quote of the string starting at self.pos.
+
+        Reads more chunks as needed, resuming where the previous scan
+        stopped, so a long string costs linear time. With keep=False the
+        scanned part is dropped from the buffer as it goes, so skipping a
+        string takes no memory proportional to its length. A raw control
+        character raises at once instead of buffering the rest of the file.
+        """
+        i = self.pos + 1
+        while True:
+            buf = self.buf
+            m = STRING_SPECIAL_RE.search(buf, i)
+            if m is None:
+                i = len(buf)
+            elif m.group() == '"':
+                return m.end()
+            elif m.group() == "\\":
+                if m.end() < len(buf):
+                    i = m.end() + 1
+                    continue
+                # The escape is split across chunks; rescan from the backslash
+                i = m.start()
+            else:
+                raise json.JSONDecodeError("Invalid control character at", buf, m.start())
+
+            if self.eof:
+                raise json.JSONDecodeError("Unterminated string starting at", buf, self.pos)
+            if not keep:
+                self.pos = i
+            shift = self.pos
+            # Grow reads with the kept part so re-buffering a long string stays linear
+            self._fill(len(self.buf) - self.pos)
+            i -= shift
+
+    def next_token(self, decode: bool = True) -> Token:
+        """Read the next token.
+
+        With decode=False strings are skipped and returned as ("value", None).
+        """
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+
+            if pos >= len(buf):
+                if self.eof:
+                    return ("eof", None)
+                self._fill()
+                continue
+
+            c = buf[pos]
+            if c in PUNCTUATION:
+                self.pos = pos + 1
+                return (c, None)
+
+            if c == '"':
+                end = self._string_end(keep=decode)
+                if decode:
+                    # The whole string is buffered now, so any error is real
+                    value, end = scanstring(self.buf, self.pos + 1, True)
+                else:
+                    value = None
+                self.pos = end
+                return ("value", value)
+
+            if c == "-" or c.isdigit():
+                m = NUMBER_RE.match(buf, pos)
+                # A chunk may end inside a number ("1.", "1e-"), so only accept
+                # a match that is followed by a character that cannot extend it
+                if not self.eof and (m is None or m.end() == len(buf)
+                                     or buf[m.end()] in NUMBER_TAIL):
+                    self._fill()
+                    continue
+                if m is None:
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+                integer, frac, exp = m.groups()
+                self.pos = m.end()
+                if frac or exp:
+                    return ("value", float(integer + (frac or "") + (exp or "")))
+                return ("value", int(integer))
+
+            for literal, value in LITERALS.items():
+                if buf.startswith(literal, pos):
+                    self.pos = pos + len(literal)
+                    return ("value", value)
+            if len(buf) - pos < 5 and not self.eof:
+                self._fill()
+                continue
+            raise json.JSONDecodeError("Expecting value", buf, pos)
+
+    def expect(self, kind: str) -> Token:
+        """Read the next token and fail unless it is of the given kind."""
+        token = self.next_token()
+        if token[0] != kind:
+            raise json.JSONDecodeError(f"Expecting '{kind}'", self.buf, self.pos)
+        return token
+
+    def next_member(self, seen: bool) -> Token:
+        """Read the token starting the next array item or object key.
+
+        Consumes the separating comma if a member was already seen.
+        Returns the closing bracket token when the container ends.
+        """
+        token = self.next_token()
+        if seen and token[0] == ",":
+            token = self.next_token()
+        elif seen and token[0] not in "}]":
+            raise json.JSONDecodeError("Expecting ',' delimiter", self.buf, self.pos)
+        return token
+
+    def read_key(self, token: Token) -> str:
+        """Validate an object key token and consume the following colon."""
+        if token[0] != "value" or not isinstance(token[1], str):
+            raise json.JSONDecodeError("Expecting property name", self.buf, self.pos)
+        self.expect(":")
+        return token[1]
+
+    def read_value(self, token: Token) -> Any:
+        """Materialize the value starting at token."""
+        kind, value = token
+        if kind == "value":
+            return value
+        if kind not in "{[":
+            raise json.JSONDecodeError("Expecting value", self.buf, self.pos)
+
+        root = {} if kind == "{" else []
+        # Each frame: [container, seen any member]
+        stack = [[root, False]]
+        while stack:
+            frame = stack[-1]
+            container, seen = frame
+            token = self.next_member(seen)
+            frame[1] = True
+
+            if token[0] in "}]":
+                stack.pop()
+                continue
+
+            if isinstance(container, dict):
+                key = self.read_key(token)
+                token = self.next_token()
+            else:
+                key = None
+
+            if token[0] in "{[":
+                child = {} if token[0] == "{" else []
+                stack.append([child, False])
+            else:
+                child = self.read_value(token)
+
+            if key is None:
+                container.append(child)
+            else:
+                container[key] = child
+
+        return root
+
+    def skip_value(self, token: Token):
+        """Consume the value starting at token without building it."""
+        kind = token[0]
+        if kind == "value":
+            return
+        if kind not in "{[":
+            raise json.JSONDecodeError("Expecting value", self.buf, self.pos)
+
+        depth = 1
+        while depth:
+            kind = self.next_token(decode=False)[0]
+            if kind in "{[":
+                depth += 1
+            elif kind in "}]":
+                depth -= 1
+            elif kind == "eof":
+                raise json.JSONDecodeError("Unexpected end of data", self.buf, self.pos)
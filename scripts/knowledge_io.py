@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Read and write project_analysis knowledge files in several formats.
+
+Layouts:
+    pretty    indented JSON, for debugging and diffs
+    min       minified JSON
+    columnar  minified JSON where uniform tables ({key: {field: value}}) are
+              stored column by column and every string in them is stored
+              once in a string table
+
+Compression (applied on top of any layout):
+    none      name.json
+    gzip      name.json.gz
+    zstd      name.json.zst (requires the optional zstandard package)
+
+load_knowledge() detects compression from magic bytes and the layout from
+the decoded JSON, so readers never need to know how a file was written.
+
+Usage:
+    from knowledge_io import load_knowledge, find_knowledge_file
+    actions = load_knowledge(find_knowledge_file(data_dir, "actions_knowledge.json"))
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fsutil import atomic_write
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HAS_ZSTD = zstandard is not None
+
+LAYOUTS = ("pretty", "min", "columnar")
+COMPRESSIONS = ("none", "gzip", "zstd")
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+COLUMNAR_MARKER = "__columnar__"
+COLUMNAR_VERSION = 1
+
+
+def to_columnar(table: Dict[str, dict]) -> Optional[dict]:
+    """Column-oriented encoding of a {key: {field: value}} table.
+
+    Returns None unless every row is a dict with the same fields in the
+    same order. Keys and string cells become indexes into "strings".
+    """
+    rows = list(table.values())
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        return None
+    fields = list(rows[0])
+    if any(list(row) != fields for row in rows):
+        return None
+
+    strings: List[str] = []
+    ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in ids:
+            ids[value] = len(strings)
+            strings.append(value)
+        return ids[value]
+
+    columns = {}
+    interned = []
+    for field in fields:
+        values = [row[field] for row in rows]
+        if all(isinstance(v, str) for v in values):
+            columns[field] = [intern(v) for v in values]
+            interned.append(field)
+        else:
+            columns[field] = values
+
+    return {
+        COLUMNAR_MARKER: COLUMNAR_VERSION,
+        "keys": [intern(k) for k in table],
+        "fields": fields,
+        "interned": interned,
+        "columns": columns,
+        "strings": strings,
+    }
+
+
+def from_columnar(data: dict) -> Dict[str, dict]:
+    """Decode to_columnar() output back into a {key: {field: value}} table."""
+    strings = data["strings"]
+    interned = set(data["interned"])
+    columns = [
+        [strings[i] for i in data["columns"][f]] if f in interned else data["columns"][f]
+        for f in data["fields"]
+    ]
+    return {
+        strings[k]: dict(zip(data["fields"], values))
+        for k, values in zip(data["keys"], zip(*columns))
+    }
+
+
+def encode_knowledge(data: Any, layout: str = "pretty") -> bytes:
+    """Serialize one knowledge file's data in the given layout."""
+    if layout == "pretty":
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    if layout == "columnar" and isinstance(data, dict):
+        data = to_columnar(data) or data
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compress(raw: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        # mtime=0 keeps output byte-identical between runs
+        return gzip.compress(raw, compresslevel=9, mtime=0)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=19).compress(raw)
+    return raw
+
+
+def decompress(raw: bytes) -> bytes:
+    if raw.startswith(GZIP_MAGIC):
+        return gzip.decompress(raw)
+    if raw.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("reading .zst knowledge files requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+    return raw
+
+
+def dump_knowledge(output_dir: Path, name: str, data: Any,
+                   layout: str = "pretty", compression: str = "none") -> Path:
+    """Write data as output_dir/name (+ compression suffix).
+
+    Other variants of the same file are removed so readers never pick up a
+    stale one.
+    """
+    path = output_dir / (name + SUFFIXES[compression])
+    with atomic_write(path) as tmp_path:
+        tmp_path.write_bytes(compress(encode_knowledge(data, layout), compression))
+
+    for other in SUFFIXES.values():
+        stale = output_dir / (name + other)
+        if stale != path and stale.exists():
+            stale.unlink()
+    return path
+
+
+def find_knowledge_file(data_dir: Path, name: str) -> Path:
+    """Path of whichever variant of name exists (plain JSON preferred)."""
+    for suffix in SUFFIXES.values():
+        path = data_dir / (name + suffix)
+        if path.exists():
+            return path
+    raise FileNotFoundError(data_dir / name)
+
+
+def load_knowledge(path: Path) -> Any:
+    """Load a knowledge file written in any layout and compression."""
+    data = json.loads(decompress(Path(path).read_bytes()).decode("utf-8"))
+    if isinstance(data, dict) and COLUMNAR_MARKER in data:
+        return from_columnar(data)
+    return data
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite store for the ACE knowledge base.
+
+build_project_analysis.py writes data/project_analysis/knowledge.db next to
+the JSON files. Lookups such as "top actions for objectClass X" or "param
+examples for System:create-object" hit indexes instead of parsing the
+multi-megabyte JSON files on every call. Co-occurrence neighbours ("what
+usually follows Keyboard:on-key-pressed") are stored the same way.
+
+Usage:
+    python scripts/knowledge_store.py build                  # rebuild db from the JSON files
+    python scripts/knowledge_store.py get System:create-object
+    python scripts/knowledge_store.py top --object-class Player --limit 5
+    python scripts/knowledge_store.py neighbours Keyboard:on-key-pressed
+
+    from knowledge_store import KnowledgeStore
+    with KnowledgeStore() as store:
+        store.top("actions", object_class="Player")
+        store.param_examples("System:create-object")
+        store.neighbours("Keyboard:on-key-pressed")
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fsutil import atomic_write
+from knowledge_io import find_knowledge_file, load_knowledge
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "project_analysis"
+STORE_FILE = "knowledge.db"
+STORE_VERSION = 2
+KINDS = ("actions", "conditions")
+RELATIONS = ("cond_action", "parent_child")
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE aces (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    id TEXT NOT NULL,
+    object_class TEXT NOT NULL,
+    behavior_type TEXT NOT NULL,
+    usage_count INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    param_examples TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX aces_by_usage ON aces (kind, usage_count DESC, rank);
+CREATE INDEX aces_by_id ON aces (id, kind);
+CREATE INDEX aces_by_object_class ON aces (object_class, kind, usage_count DESC, rank);
+CREATE INDEX aces_by_behavior_type ON aces (behavior_type, kind, usage_count DESC, rank);
+CREATE TABLE cooccurrence (
+    relation TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (relation, source, rank)
+) WITHOUT ROWID;
+"""
+
+
+def write_store(path: Path, aces_by_kind: Dict[str, dict], index: dict,
+                cooccurrence: Optional[dict] = None):
+    """Write the knowledge store atomically.
+
+    aces_by_kind maps "actions"/"conditions" to the usage-sorted ACE dicts
+    written to *_knowledge.json; rank keeps their order for ties.
+    cooccurrence is the contents of cooccurrence_knowledge.json.
+    """
+    with atomic_write(path) as tmp_path:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [("version", str(STORE_VERSION)), ("index", json.dumps(index, ensure_ascii=False))],
+            )
+            for kind in KINDS:
+                conn.executemany(
+                    "INSERT INTO aces VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (kind, key, data["id"], data["objectClass"], data["behaviorType"],
+                         data["usage_count"], rank,
+                         json.dumps(data["param_examples"], ensure_ascii=False))
+                        for rank, (key, data) in enumerate(aces_by_kind.get(kind, {}).items())
+                    ),
+                )
+            for relation in RELATIONS:
+                conn.executemany(
+                    "INSERT INTO cooccurrence VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (relation, source, rank, neighbour["key"], neighbour["count"])
+                        for source, neighbours in (cooccurrence or {}).get(relation, {}).items()
+                        for rank, neighbour in enumerate(neighbours)
+                    ),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def build_from_json(data_dir: Path = DATA_DIR) -> Path:
+    """(Re)build the store from the *_knowledge.json files in data_dir.
+
+    Files may be in any format written by knowledge_io.
+    """
+    aces_by_kind = {}
+    for kind in KINDS:
+        aces_by_kind[kind] = load_knowledge(find_knowledge_file(data_dir, f"{kind}_knowledge.json"))
+    index = load_knowledge(find_knowledge_file(data_dir, "index.json"))
+    try:
+        cooccurrence = load_knowledge(find_knowledge_file(data_dir, "cooccurrence_knowledge.json"))
+    except FileNotFoundError:
+        cooccurrence = None
+
+    path = data_dir / STORE_FILE
+    write_store(path, aces_by_kind, index, cooccurrence)
+    return path
+
+
+def _row_to_entry(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "objectClass": row["object_class"],
+        "behaviorType": row["behavior_type"],
+        "usage_count": row["usage_count"],
+        "param_examples": json.loads(row["param_examples"]),
+    }
+
+
+def _is_current(path: Path, source: Path) -> bool:
+    """Whether the store exists, has this STORE_VERSION and is newer than source."""
+    if not path.exists():
+        return False
+    if source.exists() and source.stat().st_mtime > path.stat().st_mtime:
+        return False
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return row is not None and row[0] == str(STORE_VERSION)
+
+
+class KnowledgeStore:
+    """Read-only queries over knowledge.db.
+
+    Entries are returned in the same shape as *_knowledge.json values. If
+    the database is missing, from another STORE_VERSION or older than the
+    JSON files it is rebuilt from them first (see write_store). If that
+    fails, e.g. in a read-only data dir, an existing database is used as
+    is; run `knowledge_store.py build` to refresh it.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        path = data_dir / STORE_FILE
+        try:
+            source = find_knowledge_file(data_dir, "actions_knowledge.json")
+        except FileNotFoundError:
+            source = data_dir / "actions_knowledge.json"
+        if not _is_current(path, source):
+            try:
+                build_from_json(data_dir)
+            except (OSError, sqlite3.Error) as e:
+                if not path.exists():
+                    raise
+                print(f"  ⚠️ Could not rebuild {path}, using it as is "
+                      f"(run knowledge_store.py build): {e}", file=sys.stderr)
+
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key: str, kind: str = "actions") -> Optional[dict]:
+        """Look up one ACE by key, e.g. "System:create-object"."""
+        row = self.conn.execute(
+            "SELECT * FROM aces WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return _row_to_entry(row) if row else None
+
+    def param_examples(self, key: str, kind: str = "actions") -> List[dict]:
+        """Recorded parameter examples for one ACE key."""
+        row = self.conn.execute(
+            "SELECT param_examples FROM aces WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return json.loads(row["param_examples"]) if row else []
+
+    def find_by_id(self, ace_id: str, kind: Optional[str] = None) -> List[Tuple[str, dict]]:
+        """All (key, entry) pairs for an ACE id across object classes, most used first."""
+        sql = "SELECT * FROM aces WHERE id = ?"
+        args = [ace_id]
+        if kind:
+            sql += " AND kind = ?"
+            args.append(kind)
+        sql += " ORDER BY usage_count DESC, rank"
+        return [(row["key"], _row_to_entry(row)) for row in self.conn.execute(sql, args)]
+
+    def top(self, kind: str = "actions", object_class: Optional[str] = None,
+            behavior_type: Optional[str] = None, limit: int = 10) -> List[Tuple[str, dict]]:
+        """Most used (key, entry) pairs, optionally filtered by objectClass/behaviorType."""
+        sql = "SELECT * FROM aces WHERE kind = ?"
+        args = [kind]
+        if object_class is not None:
+            sql += " AND object_class = ?"
+            args.append(object_class)
+        if behavior_type is not None:
+            sql += " AND behavior_type = ?"
+            args.append(behavior_type)
+        sql += " ORDER BY usage_count DESC, rank LIMIT ?"
+        args.append(limit)
+        return [(row["key"], _row_to_entry(row)) for row in self.conn.execute(sql, args)]
+
+    def neighbours(self, key: str, relation: str = "cond_action", limit: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent (key, count) partners of an ACE.
+
+        "cond_action" gives actions used in the same event as condition key;
+        "parent_child" gives conditions of sub-events under it.
+        """
+        rows = self.conn.execute(
+            "SELECT target, count FROM cooccurrence WHERE relation = ? AND source = ? "
+            "ORDER BY rank LIMIT ?", (relation, key, limit)
+        )
+        return [(row["target"], row["count"]) for row in rows]
+
+    def index(self) -> dict:
+        """The summary written to index.json."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'index'").fetchone()
+        return json.loads(row["value"]) if row else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the ACE knowledge store.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory with the knowledge files (default: data/project_analysis)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("build", help="Rebuild knowledge.db from the JSON files")
+
+    get_p = sub.add_parser("get", help="Show one ACE by key")
+    get_p.add_argument("key")
+    get_p.add_argument("--kind", choices=KINDS, default="actions")
+
+    top_p = sub.add_parser("top", help="List the most used ACEs")
+    top_p.add_argument("--kind", choices=KINDS, default="actions")
+    top_p.add_argument("--object-class")
+    top_p.add_argument("--behavior-type")
+    top_p.add_argument("--limit", type=int, default=10)
+
+    neighbours_p = sub.add_parser("neighbours", help="List what usually goes with an ACE")
+    neighbours_p.add_argument("key")
+    neighbours_p.add_argument("--relation", choices=RELATIONS, default="cond_action")
+    neighbours_p.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        path = build_from_json(args.data_dir)
+        print(f"📁 Output: {path}")
+        return
+
+    with KnowledgeStore(args.data_dir) as store:
+        if args.command == "get":
+            entry = store.get(args.key, args.kind)
+            if entry is None:
+                print(f"❌ Not found: {args.key}")
+                sys.exit(1)
+            print(json.dumps(entry, indent=2, ensure_ascii=False))
+        elif args.command == "neighbours":
+            for key, count in store.neighbours(args.key, args.relation, args.limit):
+                print(f"   {key}: {count}")
+        else:
+            for key, entry in store.top(args.kind, args.object_class, args.behavior_type, args.limit):
+                print(f"   {key}: {entry['usage_count']} uses")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,35 @@ Preflight validation for Construct 3 clipboard JSON.
 Usage:
     python scripts/preflight.py input.json
     echo '{"is-c3-clipboard-data":true,...}' | python scripts/preflight.py
+
+Batch mode (one JSON result per line, exit 1 if any input fails):
+    python scripts/preflight.py --batch a.json b.json c.json
+    python scripts/preflight.py --batch --jobs 4 candidates/*.json
+    cat candidates.ndjson | python scripts/preflight.py --batch
+
+Server mode (one warm validator, newline-delimited JSON in, results out):
+    python scripts/preflight.py --serve                  # over stdin/stdout
+    python scripts/preflight.py --serve --port 8765      # over 127.0.0.1:8765
+
+In-process API:
+    from preflight import validate_payloads
+    results = validate_payloads([("a.json", text_or_parsed_json), ...], jobs=4)
+
+Timing trace (per input and per C3ClipboardValidator check, see instrumentation.py):
+    python scripts/preflight.py --batch --trace preflight-trace.json candidates/*.json
+    C3_TRACE=preflight-trace.json python scripts/preflight.py input.json
 """
 
+import argparse
 import json
+import os
+import socketserver
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, List, Sequence, Tuple
+
+from instrumentation import TRACER, trace_target
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 VALIDATOR_DIR = SCRIPT_DIR.parent / ".claude" / "skills" / "construct3-copilot" / "scripts"
@@ -17,26 +41,171 @@ sys.path.insert(0, str(VALIDATOR_DIR))
 
 from validate_output import C3ClipboardValidator  # noqa: E402
 
+# Batches smaller than this are validated in-process even when jobs > 1
+POOL_THRESHOLD = 32
 
-def main():
-    if len(sys.argv) > 1:
-        arg = sys.argv[1]
-        if arg.endswith(".json"):
-            with open(arg, "r", encoding="utf-8") as f:
-                content = f.read()
-        else:
-            content = arg
+# One validator per worker process, created by _init_worker
+_worker_validator = None
+
+
+def new_validator() -> C3ClipboardValidator:
+    """A validator whose checks are timed when tracing is on."""
+    return TRACER.instrument(C3ClipboardValidator(), "check")
+
+
+def validate_content(validator: C3ClipboardValidator, label: str, content: Any) -> dict:
+    """Validate one clipboard payload and return a machine-readable result.
+
+    content may be a JSON string, already-parsed data, or the exception
+    raised while reading the input. Clears the validator's errors and
+    warnings first so a single instance can be reused across inputs. Any
+    failure is reported in the result rather than raised, so one bad
+    input never stops a batch or a server.
+    """
+    result = {"input": label, "valid": False, "errors": [], "warnings": []}
+    if isinstance(content, Exception):
+        result["errors"].append(f"Read error: {content}")
+        return result
+    if isinstance(content, (str, bytes)):
+        try:
+            with TRACER.span("parse", "input", input=label, size=len(content)):
+                data = json.loads(content)
+        except ValueError as e:
+            result["errors"].append(f"JSON parse error: {e}")
+            return result
     else:
-        content = sys.stdin.read()
+        data = content
+
+    validator.errors = []
+    validator.warnings = []
+    try:
+        with TRACER.span("validate", "input", input=label) as trace_args:
+            result["valid"] = bool(validator.validate(data))
+            trace_args.update(valid=result["valid"], errors=len(validator.errors))
+    except Exception as e:
+        result["valid"] = False
+        result["errors"] = [f"Validator error: {type(e).__name__}: {e}"]
+        validator.errors = []
+        validator.warnings = []
+        return result
+    result["errors"] = list(validator.errors)
+    result["warnings"] = list(validator.warnings)
+    return result
+
+
+def _init_worker():
+    global _worker_validator
+    _worker_validator = C3ClipboardValidator()
+
+
+def _validate_in_worker(item: Tuple[str, Any]) -> dict:
+    return validate_content(_worker_validator, *item)
+
+
+def validate_payloads(items: Sequence[Tuple[str, Any]], jobs: int = 1) -> List[dict]:
+    """Validate many (label, payload) pairs in-process, results in input order.
+
+    Uses one validator for the whole batch; with jobs > 1 and at least
+    POOL_THRESHOLD items, the batch is spread over a process pool with one
+    validator per worker. While tracing, batches stay in-process so every
+    check is timed in one trace.
+    """
+    items = list(items)
+    if jobs > 1 and len(items) >= POOL_THRESHOLD and not TRACER.enabled:
+        chunksize = max(1, len(items) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            return list(executor.map(_validate_in_worker, items, chunksize=chunksize))
+
+    validator = new_validator()
+    return [validate_content(validator, label, content) for label, content in items]
+
+
+def iter_lines(stream: IO[str], prefix: str) -> Iterator[Tuple[str, str]]:
+    """Yield (label, content) for each non-blank line of newline-delimited JSON."""
+    for lineno, line in enumerate(stream, 1):
+        if line.strip():
+            yield f"{prefix}:{lineno}", line
+
+
+def iter_batch_inputs(paths: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Yield (label, content) for each file, or for each stdin line if no files are given.
+
+    A file that cannot be read yields its exception as content, which
+    validate_content reports as that input's error.
+    """
+    paths = list(paths)
+    if not paths:
+        yield from iter_lines(sys.stdin, "stdin")
+        return
+
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield path, f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            yield path, e
 
+
+def run_batch(inputs: Iterable[Tuple[str, Any]], out: IO[str]) -> bool:
+    """Validate every input with one validator, writing one JSON result per line."""
+    validator = new_validator()
+    all_valid = True
+    for label, content in inputs:
+        result = validate_content(validator, label, content)
+        all_valid = all_valid and result["valid"]
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+    return all_valid
+
+
+class PreflightRequestHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON over a socket connection, sharing the server's validator."""
+
+    def handle(self):
+        rfile = (line.decode("utf-8", errors="replace") for line in self.rfile)
+        wfile = self.wfile
+        peer = f"{self.client_address[0]}:{self.client_address[1]}"
+        for label, content in iter_lines(rfile, peer):
+            result = validate_content(self.server.validator, label, content)
+            wfile.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+            wfile.flush()
+
+
+class PreflightServer(socketserver.TCPServer):
+    """Single-threaded server so connections never share the validator concurrently."""
+
+    allow_reuse_address = True
+
+    def __init__(self, port: int):
+        super().__init__(("127.0.0.1", port), PreflightRequestHandler)
+        self.validator = new_validator()
+
+
+def serve(port: int = None):
+    """Keep one validator warm and answer requests until EOF or Ctrl+C."""
+    if port is None:
+        run_batch(iter_lines(sys.stdin, "stdin"), sys.stdout)
+        return
+
+    with PreflightServer(port) as server:
+        print(f"🔌 Listening on 127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def validate_single(content: str):
+    """Validate one input and print a human-readable report."""
     try:
         data = json.loads(content)
     except json.JSONDecodeError as e:
         print(f"❌ JSON parse error: {e}")
         sys.exit(1)
 
-    validator = C3ClipboardValidator()
-    is_valid = validator.validate(data)
+    validator = new_validator()
+    with TRACER.span("validate", "input", input="single"):
+        is_valid = validator.validate(data)
 
     if is_valid:
         print("✅ Validation passed! JSON format conforms to C3 clipboard spec")
@@ -53,5 +222,69 @@ def main():
     sys.exit(0 if is_valid else 1)
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Validate Construct 3 clipboard JSON.")
+    parser.add_argument("inputs", nargs="*",
+                        help="JSON file(s), or a JSON string; reads stdin if omitted")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", action="store_true",
+                      help="Validate many files (or NDJSON on stdin), one JSON result per line")
+    mode.add_argument("--serve", action="store_true",
+                      help="Keep a validator warm and answer NDJSON requests on stdin or --port")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="With --batch, worker processes for large batches (0 = all CPUs)")
+    parser.add_argument("--port", type=int,
+                        help="With --serve, listen on 127.0.0.1:PORT instead of stdin")
+    parser.add_argument("--trace", type=Path,
+                        help="Write a Chrome trace of per-input and per-check timings here "
+                             "(or set C3_TRACE); --serve writes it on exit")
+    args = parser.parse_args()
+
+    if args.port is not None and not args.serve:
+        parser.error("--port requires --serve")
+
+    trace_path = trace_target(args.trace)
+    if trace_path:
+        TRACER.enable("preflight")
+    try:
+        dispatch(parser, args)
+    finally:
+        if trace_path:
+            TRACER.save(trace_path)
+            print(f"📈 Trace: {trace_path}", file=sys.stderr)
+
+
+def dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Run the mode selected on the command line."""
+    if args.serve:
+        serve(args.port)
+        return
+
+    if args.batch:
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        if jobs == 1:
+            sys.exit(0 if run_batch(iter_batch_inputs(args.inputs), sys.stdout) else 1)
+
+        results = validate_payloads(iter_batch_inputs(args.inputs), jobs)
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        sys.exit(0 if all(r["valid"] for r in results) else 1)
+
+    if len(args.inputs) > 1:
+        parser.error("pass --batch to validate more than one input")
+
+    if args.inputs:
+        arg = args.inputs[0]
+        if arg.endswith(".json"):
+            with open(arg, "r", encoding="utf-8") as f:
+                content = f.read()
+        else:
+            content = arg
+    else:
+        content = sys.stdin.read()
+
+    validate_single(content)
+
+
 if __name__ == "__main__":
     main()
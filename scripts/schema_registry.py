@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Cached lookup of ACE definitions from data/schemas.
+
+Resolves a plugin or behavior id plus an ACE kind and id to its schema
+definition (and its params list) without rescanning the JSON files. Per
+addon files are loaded lazily on first access and indexed by
+(addon id, kind, ace id); scriptName/expressionName lookups build a
+second index over every addon on first use.
+
+Usage:
+    python scripts/schema_registry.py lookup sprite actions set-animation
+    python scripts/schema_registry.py script-name SetAnim
+    python scripts/schema_registry.py snapshot /tmp/schemas.pickle
+
+    from schema_registry import get_registry
+    registry = get_registry()
+    registry.params("Sprite", "actions", "set-animation")
+"""
+
+import argparse
+import json
+import pickle
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fsutil import atomic_write
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "data" / "schemas"
+SOURCES = ("plugins", "behaviors")
+ACE_KINDS = ("conditions", "actions", "expressions")
+SNAPSHOT_VERSION = 1
+
+AceKey = Tuple[str, str, str]
+
+
+class SchemaRegistry:
+    """In-memory index of plugin and behavior ACE definitions.
+
+    Addon ids are matched case-insensitively, so both the schema id
+    ("eightdir") and Construct's originalId ("EightDir") resolve.
+    """
+
+    def __init__(self, schema_dir: Path = SCHEMA_DIR):
+        self.schema_dir = schema_dir
+        self._sources: Optional[Dict[str, str]] = None   # addon id -> "plugins"/"behaviors"
+        self._addons: Dict[str, dict] = {}                # addon id -> schema file contents
+        self._aces: Dict[AceKey, dict] = {}               # (addon id, kind, ace id) -> ACE
+        self._by_script_name: Optional[Dict[str, List[AceKey]]] = None
+
+    def _load_sources(self) -> Dict[str, str]:
+        if self._sources is None:
+            sources = {}
+            for source in SOURCES:
+                with open(self.schema_dir / source / "index.json", 'r', encoding='utf-8') as f:
+                    for addon_id in json.load(f)[source]:
+                        sources[addon_id] = source
+            self._sources = sources
+        return self._sources
+
+    def addon_ids(self, source: Optional[str] = None) -> List[str]:
+        """Known plugin and/or behavior ids."""
+        return [a for a, s in self._load_sources().items() if source in (None, s)]
+
+    def source_of(self, addon_id: str) -> Optional[str]:
+        """Source directory ("plugins" or "behaviors") of an addon id, else None."""
+        return self._load_sources().get(addon_id.lower())
+
+    def addon(self, addon_id: str) -> Optional[dict]:
+        """Full schema for a plugin or behavior, loading its file on first access."""
+        addon_id = addon_id.lower()
+        addon = self._addons.get(addon_id)
+        if addon is not None:
+            return addon
+
+        source = self.source_of(addon_id)
+        if source is None:
+            return None
+
+        with open(self.schema_dir / source / f"{addon_id}.json", 'r', encoding='utf-8') as f:
+            addon = json.load(f)
+        for kind in ACE_KINDS:
+            for ace in addon.get(kind, []):
+                self._aces[(addon_id, kind, ace["id"])] = ace
+        self._addons[addon_id] = addon
+        return addon
+
+    def resolve(self, addon_id: str, kind: str, ace_id: str) -> Optional[dict]:
+        """ACE definition for (addon id, kind, ace id), or None if unknown."""
+        key = (addon_id.lower(), kind, ace_id)
+        ace = self._aces.get(key)
+        if ace is None and key[0] not in self._addons:
+            self.addon(key[0])
+            ace = self._aces.get(key)
+        return ace
+
+    def params(self, addon_id: str, kind: str, ace_id: str) -> Optional[List[dict]]:
+        """Params list for an ACE ([] if it takes none), or None if the ACE is unknown."""
+        ace = self.resolve(addon_id, kind, ace_id)
+        return None if ace is None else ace.get("params", [])
+
+    def load_all(self):
+        """Load every plugin and behavior file."""
+        for addon_id in self.addon_ids():
+            self.addon(addon_id)
+
+    def by_script_name(self, name: str, kind: Optional[str] = None) -> List[Tuple[AceKey, dict]]:
+        """All ACEs whose scriptName (or expressionName) matches, as ((addon, kind, id), ACE)."""
+        if self._by_script_name is None:
+            self.load_all()
+            index: Dict[str, List[AceKey]] = {}
+            for key, ace in self._aces.items():
+                script_name = ace.get("scriptName") or ace.get("expressionName")
+                if script_name:
+                    index.setdefault(script_name, []).append(key)
+            self._by_script_name = index
+
+        return [(key, self._aces[key]) for key in self._by_script_name.get(name, [])
+                if kind in (None, key[1])]
+
+    def fingerprint(self) -> List[Tuple[str, int, int]]:
+        """(path, mtime_ns, size) of every schema file the registry reads."""
+        result = []
+        for source in SOURCES:
+            for path in sorted((self.schema_dir / source).glob("*.json")):
+                st = path.stat()
+                result.append((f"{source}/{path.name}", st.st_mtime_ns, st.st_size))
+        return result
+
+    def save_snapshot(self, path: Path):
+        """Pickle a fully loaded registry for fast startup."""
+        self.load_all()
+        self.by_script_name("")
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self.fingerprint(),
+            "sources": self._sources,
+            "addons": self._addons,
+            "aces": self._aces,
+            "by_script_name": self._by_script_name,
+        }
+        with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_snapshot(cls, path: Path, schema_dir: Path = SCHEMA_DIR) -> "SchemaRegistry":
+        """Load a pickled registry, rebuilding the snapshot if it is missing or stale."""
+        registry = cls(schema_dir)
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            state = None
+
+        if (state and state.get("version") == SNAPSHOT_VERSION
+                and state["fingerprint"] == registry.fingerprint()):
+            registry._sources = state["sources"]
+            registry._addons = state["addons"]
+            registry._aces = state["aces"]
+            registry._by_script_name = state["by_script_name"]
+        else:
+            try:
+                registry.save_snapshot(path)
+            except OSError as e:
+                print(f"  ⚠️ Could not write schema snapshot {path}: {e}", file=sys.stderr)
+        return registry
+
+
+@lru_cache(maxsize=None)
+def get_registry(schema_dir: Path = SCHEMA_DIR, snapshot: Optional[Path] = None) -> SchemaRegistry:
+    """Shared registry per schema directory (and optional snapshot path)."""
+    if snapshot is not None:
+        return SchemaRegistry.from_snapshot(snapshot, schema_dir)
+    return SchemaRegistry(schema_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up ACE definitions in data/schemas.")
+    parser.add_argument("--schema-dir", type=Path, default=SCHEMA_DIR,
+                        help="Schema directory (default: data/schemas)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lookup_p = sub.add_parser("lookup", help="Show one ACE definition")
+    lookup_p.add_argument("addon", help="Plugin or behavior id, e.g. sprite or EightDir")
+    lookup_p.add_argument("kind", choices=ACE_KINDS)
+    lookup_p.add_argument("ace_id")
+
+    script_p = sub.add_parser("script-name", help="Find ACEs by scriptName/expressionName")
+    script_p.add_argument("name")
+    script_p.add_argument("--kind", choices=ACE_KINDS)
+
+    snapshot_p = sub.add_parser("snapshot", help="Write a pickled snapshot for fast startup")
+    snapshot_p.add_argument("path", type=Path)
+
+    args = parser.parse_args()
+    registry = SchemaRegistry(args.schema_dir)
+
+    if args.command == "lookup":
+        ace = registry.resolve(args.addon, args.kind, args.ace_id)
+        if ace is None:
+            print(f"❌ Not found: {args.addon} {args.kind} {args.ace_id}")
+            sys.exit(1)
+        print(json.dumps(ace, indent=2, ensure_ascii=False))
+    elif args.command == "script-name":
+        for (addon_id, kind, ace_id), _ in registry.by_script_name(args.name, args.kind):
+            print(f"   {addon_id} {kind} {ace_id}")
+    else:
+        registry.save_snapshot(args.path)
+        print(f"📁 Output: {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Indexed lookup of translation strings from source/zh-CN_R466.csv.
+
+Parses the CSV once into parallel sorted arrays (keys, zh, en) and caches
+them as a pickle next to the CSV, keyed by the CSV's mtime and size.
+Exact lookups use a dict; prefix lookups such as "all strings under
+text.plugins.sprite.actions" are two binary searches over the sorted keys.
+
+Usage:
+    python scripts/translations.py get text.plugins.sprite.name
+    python scripts/translations.py prefix text.plugins.sprite.actions.set-animation
+
+    from translations import get_translations
+    strings = get_translations()
+    strings.get("text.plugins.sprite.name", "zh")
+    strings.subtree("text.plugins.sprite.actions.set-animation")
+"""
+
+import argparse
+import csv
+import pickle
+import sys
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fsutil import atomic_write
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "source"
+TRANSLATION_CSV = SOURCE_DIR / "zh-CN_R466.csv"
+CACHE_VERSION = 1
+LANGUAGES = ("zh", "en")
+
+# CSV columns as exported from POEditor: key, zh, (unused x3), en
+KEY_COLUMN, ZH_COLUMN, EN_COLUMN = 0, 1, 5
+
+
+def cache_path(csv_path: Path) -> Path:
+    return csv_path.with_name(csv_path.name + ".cache.pickle")
+
+
+class Translations:
+    """Sorted, immutable translation table."""
+
+    def __init__(self, keys: List[str], zh: List[str], en: List[str]):
+        self.keys = keys
+        self.zh = zh
+        self.en = en
+        self._index = {key: i for i, key in enumerate(keys)}
+
+    @classmethod
+    def from_csv(cls, csv_path: Path = TRANSLATION_CSV) -> "Translations":
+        """Parse the CSV, keeping the last row for duplicate keys."""
+        rows = {}
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.reader(f):
+                if len(row) > EN_COLUMN and row[KEY_COLUMN].startswith("text."):
+                    rows[row[KEY_COLUMN].strip()] = (row[ZH_COLUMN].strip(), row[EN_COLUMN].strip())
+
+        keys = sorted(rows)
+        return cls(keys, [rows[k][0] for k in keys], [rows[k][1] for k in keys])
+
+    @classmethod
+    def load(cls, csv_path: Path = TRANSLATION_CSV) -> "Translations":
+        """Load from the pickle cache, re-parsing the CSV if the cache is missing or stale."""
+        st = csv_path.stat()
+        fingerprint = (CACHE_VERSION, st.st_mtime_ns, st.st_size)
+        path = cache_path(csv_path)
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            if state["fingerprint"] == fingerprint:
+                return cls(state["keys"], state["zh"], state["en"])
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+
+        translations = cls.from_csv(csv_path)
+        state = {"fingerprint": fingerprint, "keys": translations.keys,
+                 "zh": translations.zh, "en": translations.en}
+        try:
+            with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"  ⚠️ Could not write translation cache {path}: {e}", file=sys.stderr)
+        return translations
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        """(zh, en) for an exact key, or None."""
+        i = self._index.get(key)
+        return None if i is None else (self.zh[i], self.en[i])
+
+    def get(self, key: str, lang: str = "en", default: str = "") -> str:
+        """One language's string for an exact key."""
+        i = self._index.get(key)
+        if i is None:
+            return default
+        return self.zh[i] if lang == "zh" else self.en[i]
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        # Keys under "a.b" sort between "a.b." and "a.b/" ("/" follows ".")
+        prefix = prefix.rstrip(".")
+        return bisect_left(self.keys, prefix + "."), bisect_left(self.keys, prefix + "/")
+
+    def prefix(self, prefix: str) -> List[Tuple[str, str, str]]:
+        """(key, zh, en) for every key below a dotted prefix, in key order."""
+        lo, hi = self._range(prefix)
+        return [(self.keys[i], self.zh[i], self.en[i]) for i in range(lo, hi)]
+
+    def subtree(self, prefix: str) -> Dict[str, Dict[str, str]]:
+        """Strings below a dotted prefix keyed by the remainder of the key.
+
+        subtree("text.plugins.sprite.actions.set-animation") gives
+        {"list-name": {"zh": ..., "en": ...}, "params.animation.name": {...}, ...}
+        """
+        lo, hi = self._range(prefix)
+        start = len(prefix.rstrip(".")) + 1
+        return {self.keys[i][start:]: {"zh": self.zh[i], "en": self.en[i]} for i in range(lo, hi)}
+
+
+@lru_cache(maxsize=None)
+def get_translations(csv_path: Path = TRANSLATION_CSV) -> Translations:
+    """Shared translation table per CSV file."""
+    return Translations.load(csv_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up translation strings.")
+    parser.add_argument("--csv", type=Path, default=TRANSLATION_CSV,
+                        help="Translation CSV (default: source/zh-CN_R466.csv)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    get_p = sub.add_parser("get", help="Show the strings for one key")
+    get_p.add_argument("key")
+
+    prefix_p = sub.add_parser("prefix", help="List every string below a dotted prefix")
+    prefix_p.add_argument("prefix")
+
+    args = parser.parse_args()
+    translations = get_translations(args.csv)
+
+    if args.command == "get":
+        found = translations.lookup(args.key)
+        if found is None:
+            print(f"❌ Not found: {args.key}")
+            sys.exit(1)
+        print(f"   zh: {found[0]}\n   en: {found[1]}")
+    else:
+        for key, zh, en in translations.prefix(args.prefix):
+            print(f"   {key}: {zh} | {en}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Minimal stand-in for the skill's validate_output.py, for preflight tests.
+
+Accepts dicts with "is-c3-clipboard-data": true. Like the real validator,
+it accumulates errors and warnings on the instance and can raise on
+payloads of an unexpected shape.
+"""
+
+
+class C3ClipboardValidator:
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+
+    def validate(self, data):
+        if data.get("is-c3-clipboard-data") is not True:
+            self.errors.append("Missing is-c3-clipboard-data")
+        if not data.get("items"):
+            self.warnings.append("No items")
+        return not self.errors
@@ -0,0 +1,62 @@
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import benchmark  # noqa: E402
+
+
+class DumpsDeepTests(unittest.TestCase):
+    def test_matches_json_dumps(self):
+        sheet = benchmark.generate_event_sheet(20, 4, seed=1)
+        sheet["extra"] = {"empty_list": [], "empty_dict": {}, "mixed": [1, None, {"a": "é"}]}
+        self.assertEqual(benchmark.dumps_deep(sheet), json.dumps(sheet))
+        self.assertEqual(benchmark.dumps_deep(sheet, indent="\t"), json.dumps(sheet, indent="\t"))
+
+    def test_nests_past_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 500
+        payload = benchmark.generate_clipboard(depth, depth)
+        text = benchmark.dumps_deep(payload)
+        self.assertEqual(text.count('"children": ['), depth - 1)
+
+
+class MainSmokeTests(unittest.TestCase):
+    def test_deep_run_writes_report(self):
+        # A lower limit keeps the tab-indented deep sheet small
+        limit = sys.getrecursionlimit()
+        self.addCleanup(sys.setrecursionlimit, limit)
+        sys.setrecursionlimit(400)
+        depth = 600
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "report.json"
+            argv = ["benchmark.py", "--events", f"5,{depth}", "--depth", str(depth),
+                    "--sheet-events", str(depth), "--repeat", "1", "--output", str(output)]
+            with mock.patch.object(sys, "argv", argv), \
+                    contextlib.redirect_stderr(io.StringIO()), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                benchmark.main()
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+        self.assertEqual(set(report), {"version", "commit", "python", "platform",
+                                       "params", "build", "validator"})
+        self.assertEqual(report["params"]["depth"], depth)
+        self.assertEqual([result["events"] for result in report["build"]], [5, depth])
+        for result in report["build"]:
+            self.assertEqual(set(result["stages"]), {
+                "discover", "extract", "extract_stream", "merge",
+                "sort_group", "write", "write_pretty", "write_columnar_gzip"})
+            self.assertGreater(result["bytes"], 0)
+            self.assertIn("extract_events_per_sec", result)
+        self.assertTrue("skipped" in report["validator"] or "results" in report["validator"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+BUILDER = ROOT / "scripts" / "build_project_analysis.py"
+sys.path.insert(0, str(BUILDER.parent))
+
+import build_project_analysis  # noqa: E402
+import knowledge_io  # noqa: E402
+
+OUTPUT_FILES = [
+    "actions_knowledge.json",
+    "conditions_knowledge.json",
+    "behaviors_knowledge.json",
+    "plugins_knowledge.json",
+    "cooccurrence_knowledge.json",
+    "sorted_indexes.json",
+    "index.json",
+]
+
+
+def make_event(i):
+    return {
+        "eventType": "block",
+        "conditions": [
+            {"id": "key-is-down", "objectClass": "Keyboard", "parameters": {"key": i}},
+            {"id": "every-tick", "objectClass": "System", "parameters": {}},
+        ],
+        "actions": [
+            {"id": "set-eventvar-value", "objectClass": "System",
+             "parameters": {"variable": f"v{i}", "value": str(i)}},
+            {"id": "simulate-control", "objectClass": "Player", "behaviorType": "8Direction",
+             "parameters": {"control": "up"}},
+        ],
+        "children": [
+            {
+                "eventType": "block",
+                "conditions": [{"id": "is-on-floor", "objectClass": "Player",
+                                "behaviorType": f"Platform{i % 2}"}],
+                "actions": [{"id": f"custom-{i % 5}", "objectClass": f"Obj{i % 3}",
+                             "parameters": {"n": i}}],
+            }
+        ],
+    }
+
+
+def make_projects(root, projects=6, sheets_per_project=3):
+    for p in range(projects):
+        sheets = root / f"project-{p}" / "eventSheets"
+        sheets.mkdir(parents=True)
+        for s in range(sheets_per_project):
+            n = p * sheets_per_project + s
+            sheet = {"name": f"Sheet {n}", "events": [make_event(n + k) for k in range(4)]}
+            (sheets / f"sheet-{s}.json").write_text(json.dumps(sheet), encoding="utf-8")
+
+
+def run_builder(projects_dir, output_dir, *args):
+    return subprocess.run(
+        [sys.executable, str(BUILDER), str(projects_dir), "--output", str(output_dir), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+class BuildProjectAnalysisTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.projects = self.tmp / "example-projects"
+        make_projects(self.projects)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_parallel_output_matches_serial(self):
+        serial, parallel = self.tmp / "serial", self.tmp / "parallel"
+        for out, jobs in ((serial, "1"), (parallel, "3")):
+            proc = run_builder(self.tmp, out, "--jobs", jobs)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+
+        for name in OUTPUT_FILES:
+            self.assertEqual(
+                (serial / name).read_bytes(), (parallel / name).read_bytes(), name
+            )
+
+        actions = json.loads((serial / "actions_knowledge.json").read_text(encoding="utf-8"))
+        self.assertEqual(actions["System:set-eventvar-value"]["usage_count"], 72)
+
+        pairs = json.loads((serial / "cooccurrence_knowledge.json").read_text(encoding="utf-8"))
+        self.assertEqual(pairs["cond_action"]["System:every-tick"][:2], [
+            {"key": "System:set-eventvar-value", "count": 72},
+            {"key": "Player:simulate-control", "count": 72},
+        ])
+        self.assertEqual(pairs["parent_child"]["Keyboard:key-is-down"],
+                         [{"key": "Player:is-on-floor", "count": 72}])
+        self.assertNotIn("Player:is-on-floor", pairs["parent_child"])
+
+    def test_param_example_sampling(self):
+        def examples(name, *args):
+            out = self.tmp / name
+            proc = run_builder(self.tmp, out, *args)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            actions = json.loads((out / "actions_knowledge.json").read_text(encoding="utf-8"))
+            return actions["System:set-eventvar-value"]["param_examples"]
+
+        self.assertEqual([p["variable"] for p in examples("first", "--sampling", "first")],
+                         ["v0", "v1", "v2"])
+
+        diverse = examples("diverse", "--examples", "4")
+        self.assertEqual(len(diverse), 4)
+        self.assertEqual(len({json.dumps(p, sort_keys=True) for p in diverse}), 4)
+        self.assertEqual(diverse, examples("diverse-parallel", "--examples", "4", "--jobs", "2"))
+
+        capped = examples("capped", "--example-bytes", "40")
+        self.assertEqual(len(capped), 1)
+
+    def test_output_formats_load_identically(self):
+        pretty = self.tmp / "pretty"
+        proc = run_builder(self.tmp, pretty, "--format", "pretty")
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        expected = {name: json.loads((pretty / name).read_text(encoding="utf-8"))
+                    for name in OUTPUT_FILES}
+
+        for layout, compression in (("min", "none"), ("columnar", "none"), ("columnar", "gzip")):
+            with self.subTest(layout=layout, compression=compression):
+                out = self.tmp / f"{layout}-{compression}"
+                proc = run_builder(self.tmp, out, "--format", layout, "--compress", compression)
+                self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+                for name in OUTPUT_FILES:
+                    path = knowledge_io.find_knowledge_file(out, name)
+                    self.assertEqual(path.name, name + knowledge_io.SUFFIXES[compression])
+                    self.assertEqual(knowledge_io.load_knowledge(path), expected[name], name)
+
+        columnar = (self.tmp / "columnar-none" / "actions_knowledge.json").read_text(encoding="utf-8")
+        self.assertIn(knowledge_io.COLUMNAR_MARKER, columnar)
+        self.assertEqual(columnar.count('"System"'), 1)
+
+        # Switching format replaces the previous variant instead of leaving it behind,
+        # and another writer's temp file is left alone
+        (pretty / "index.json.gz.tmp").write_bytes(b"partial")
+        proc = run_builder(self.tmp, pretty, "--compress", "gzip")
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertFalse((pretty / "index.json").exists())
+        self.assertTrue((pretty / "index.json.gz").exists())
+        self.assertEqual((pretty / "index.json.gz.tmp").read_bytes(), b"partial")
+
+    def test_trace_records_phases_and_slowest_sheets(self):
+        trace_path = self.tmp / "trace.json"
+        proc = subprocess.run(
+            [sys.executable, str(BUILDER), str(self.tmp), "--output", str(self.tmp / "out"),
+             "--jobs", "2", "--trace-files", "5"],
+            capture_output=True, text=True, check=False,
+            env={**os.environ, "C3_TRACE": str(trace_path)},
+        )
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+
+        trace = json.loads(trace_path.read_text(encoding="utf-8"))
+        summary = trace["otherData"]
+        self.assertLessEqual({"discover", "scan", "merge", "sort", "write"},
+                             set(summary["totals"]["phase"]))
+        self.assertEqual(summary["totals"]["file"]["parse"]["count"], 18)
+        self.assertEqual(summary["counters"]["sheets"]["parsed"], 18)
+        self.assertEqual(len(summary["slowest_files"]), 5)
+        self.assertTrue(all(f["file"].startswith("project-") for f in summary["slowest_files"]))
+        self.assertIn("X", {e["ph"] for e in trace["traceEvents"]})
+
+    def test_incremental_rebuild_matches_full_rebuild(self):
+        out, full = self.tmp / "out", self.tmp / "full"
+        proc = run_builder(self.tmp, out)
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertTrue((out / "build_manifest.json").exists())
+
+        proc = run_builder(self.tmp, out)
+        self.assertIn("Reusing 18 cached, parsing 0, dropping 0 removed", proc.stdout)
+
+        # Change one sheet, delete one, add one
+        changed = self.projects / "project-1" / "eventSheets" / "sheet-0.json"
+        changed.write_text(json.dumps({"events": [make_event(99)]}), encoding="utf-8")
+        (self.projects / "project-2" / "eventSheets" / "sheet-2.json").unlink()
+        added = self.projects / "project-9" / "eventSheets"
+        added.mkdir(parents=True)
+        (added / "new.json").write_text(json.dumps({"events": [make_event(7)]}), encoding="utf-8")
+
+        proc = run_builder(self.tmp, out)
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn("Reusing 16 cached, parsing 2, dropping 1 removed", proc.stdout)
+
+        proc = run_builder(self.tmp, full, "--rebuild")
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        for name in OUTPUT_FILES:
+            self.assertEqual((out / name).read_bytes(), (full / name).read_bytes(), name)
+
+    def test_streaming_parser_matches_json_load(self):
+        events = []
+        for i in range(400):
+            event = make_event(i)
+            # Values the streaming parser has to skip or decode exactly
+            event["comment"] = "\u00e9v\u00e9nement \"quoted\" \\ " * (i % 7)
+            event["metadata"] = {"sid": 10 ** 15 + i, "ratio": i / 7, "flags": [True, False, None]}
+            event["actions"][0]["parameters"]["value"] = f"lerp({i}e-3, -{i}.5E+2)"
+            events.append(event)
+        sheet = self.tmp / "big.json"
+        sheet.write_text(json.dumps({"name": "Big", "events": events, "sid": 1}, indent=2),
+                         encoding="utf-8")
+        self.assertGreater(sheet.stat().st_size, 4 * (1 << 16))
+
+        loaded, streamed = build_project_analysis.new_aces(), build_project_analysis.new_aces()
+        build_project_analysis.process_event_sheet(sheet, loaded, "big", stream=False)
+        build_project_analysis.process_event_sheet(sheet, streamed, "big", stream=True)
+        self.assertEqual(streamed, loaded)
+        self.assertEqual(list(streamed["actions"]), list(loaded["actions"]))
+
+    def test_cooccurrence_counters_are_bounded(self):
+        counters = {}
+        for i in range(100):
+            build_project_analysis.merge_counts(counters, {"common": 5, f"rare-{i}": 1}, capacity=4)
+        self.assertEqual(len(counters), 4)
+        self.assertEqual(max(counters, key=counters.get), "common")
+        self.assertEqual(counters["common"], 500)
+
+    def test_cached_sheet_partials_are_bounded(self):
+        capacity = build_project_analysis.COOCCURRENCE_CAPACITY
+        events = [{"conditions": [{"id": "every-tick", "objectClass": "System"}],
+                   "actions": [{"id": f"act-{i}", "objectClass": "System"}] * (1 + (i < 5))}
+                  for i in range(capacity * 3)]
+        sheets = self.tmp / "big" / "project" / "eventSheets"
+        sheets.mkdir(parents=True)
+        (sheets / "sheet.json").write_text(json.dumps({"events": events}), encoding="utf-8")
+
+        out = self.tmp / "big-out"
+        proc = run_builder(self.tmp / "big", out)
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+
+        manifest = json.loads((out / build_project_analysis.MANIFEST_FILE).read_text(encoding="utf-8"))
+        partial = manifest["sheets"]["project/eventSheets/sheet.json"]["aces"]
+        counts = partial["cooccurrence"]["cond_action"]["System:every-tick"]
+        self.assertEqual(len(counts), capacity)
+        self.assertEqual(list(counts)[:6], [f"System:act-{i}" for i in range(6)])
+        self.assertEqual(counts["System:act-0"], 2)
+
+    def test_streaming_parser_handles_deep_nesting(self):
+        depth = 5000
+        cond = json.dumps({"id": "every-tick", "objectClass": "System"})
+        sheet = self.tmp / "deep.json"
+        sheet.write_text(
+            '{"events": [' + f'{{"conditions": [{cond}], "children": [' * depth
+            + ']}' * depth + ']}',
+            encoding="utf-8",
+        )
+
+        # json.load hits the recursion limit and falls back to streaming
+        aces = build_project_analysis.new_aces()
+        build_project_analysis.process_event_sheet(sheet, aces, "deep")
+        self.assertEqual(aces["conditions"]["System:every-tick"]["usage_count"], depth)
+
+    def test_extraction_handles_deep_nesting_after_json_load(self):
+        # Nested deeper than the recursion limit, as json.load can return on Python 3.13+
+        depth = sys.getrecursionlimit() + 500
+        event = {}
+        for i in range(depth):
+            event = {"conditions": [{"id": "every-tick", "objectClass": "System"}],
+                     "actions": [{"id": f"act-{i % 3}", "objectClass": "System"}],
+                     "children": [event] if event else []}
+
+        aces = build_project_analysis.new_aces()
+        build_project_analysis.extract_aces_from_event(event, aces, "deep")
+        self.assertEqual(aces["conditions"]["System:every-tick"]["usage_count"], depth)
+        self.assertEqual(list(aces["actions"]), ["System:act-2", "System:act-1", "System:act-0"])
+        self.assertEqual(aces["cooccurrence"]["parent_child"]["System:every-tick"],
+                         {"System:every-tick": depth - 1})
+
+        sheet = self.tmp / "nested.json"
+        sheet.write_text(json.dumps({"events": [make_event(i) for i in range(3)]}), encoding="utf-8")
+        loaded, streamed = build_project_analysis.new_aces(), build_project_analysis.new_aces()
+        build_project_analysis.process_event_sheet(sheet, loaded, "p")
+        build_project_analysis.process_event_sheet(sheet, streamed, "p", stream=True)
+        self.assertEqual(loaded, streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import subprocess
+import sys
 import unittest
 from pathlib import Path
 
@@ -6,19 +7,31 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 VALIDATOR = ROOT / ".claude" / "skills" / "construct3-copilot" / "scripts" / "validate_output.py"
 FIXTURES = ROOT / "tests" / "fixtures"
+sys.path.insert(0, str(ROOT / "scripts"))
 
 
 class FixtureValidationTests(unittest.TestCase):
     def test_fixtures_validate(self):
-        for path in sorted(FIXTURES.glob("*.json")):
-            proc = subprocess.run(
-                ["python3", str(VALIDATOR), str(path)],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            msg = f"{path.name} failed:\n{proc.stdout}\n{proc.stderr}"
-            self.assertEqual(proc.returncode, 0, msg)
+        # Imported here so a missing validator fails this test, not collection
+        from preflight import validate_payloads
+
+        paths = sorted(FIXTURES.glob("*.json"))
+        results = validate_payloads([(path.name, path.read_text(encoding="utf-8")) for path in paths])
+        for path, result in zip(paths, results):
+            with self.subTest(fixture=path.name):
+                msg = f"{path.name} failed:\n" + "\n".join(result["errors"])
+                self.assertTrue(result["valid"], msg)
+
+    def test_cli_validates_fixture(self):
+        path = sorted(FIXTURES.glob("*.json"))[0]
+        proc = subprocess.run(
+            ["python3", str(VALIDATOR), str(path)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        msg = f"{path.name} failed:\n{proc.stdout}\n{proc.stderr}"
+        self.assertEqual(proc.returncode, 0, msg)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fsutil import atomic_write  # noqa: E402
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_replaces_on_success_and_keeps_old_file_on_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "data.json"
+            path.write_text("old", encoding="utf-8")
+
+            with atomic_write(path) as first, atomic_write(path) as second:
+                self.assertNotEqual(first, second)
+                first.write_text("first", encoding="utf-8")
+                second.write_text("second", encoding="utf-8")
+            self.assertEqual(path.read_text(encoding="utf-8"), "first")
+            self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o644)
+
+            with self.assertRaises(ValueError), atomic_write(path) as tmp_path:
+                tmp_path.write_text("partial", encoding="utf-8")
+                raise ValueError("interrupted")
+            self.assertEqual(path.read_text(encoding="utf-8"), "first")
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["data.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from instrumentation import Tracer  # noqa: E402
+
+
+class FakeValidator:
+    def __init__(self):
+        self.errors = []
+
+    def validate(self, data):
+        self.check_header(data)
+        for event in data["items"]:
+            self.check_event(event)
+        return not self.errors
+
+    def check_header(self, data):
+        if "is-c3-clipboard-data" not in data:
+            self.errors.append("missing header")
+
+    def check_event(self, event):
+        for child in event.get("children", []):
+            self.check_event(child)
+
+
+class TracerTests(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        validator = FakeValidator()
+        self.assertIs(tracer.instrument(validator, "check"), validator)
+        with tracer.span("discover") as args:
+            args["ignored"] = True
+        self.assertEqual(vars(validator), {"errors": []})
+        self.assertEqual(tracer.events, [])
+        self.assertEqual(tracer.totals, {})
+
+    def test_instrumented_checks_and_trace_file(self):
+        tracer = Tracer()
+        tracer.enable("test", max_files=2)
+        validator = tracer.instrument(FakeValidator(), "check")
+        with tracer.span("validate", "input", input="a.json") as args:
+            args["valid"] = validator.validate({"items": [{"children": [{}, {}]}]})
+
+        for i, parse_ns in enumerate([5, 50, 20]):
+            tracer.record_file(f"sheet-{i}.json", 0, {"parse": parse_ns, "extract": 1})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace.json"
+            tracer.save(path)
+            trace = json.loads(path.read_text(encoding="utf-8"))
+
+        summary = trace["otherData"]
+        self.assertEqual(summary["totals"]["check"]["check_event"]["count"], 3)
+        self.assertEqual(summary["totals"]["check"]["check_header"]["count"], 1)
+        self.assertNotIn("validate", summary["totals"]["check"])
+        self.assertEqual(summary["totals"]["file"]["parse"]["count"], 3)
+        self.assertEqual([f["file"] for f in summary["slowest_files"]],
+                         ["sheet-1.json", "sheet-2.json"])
+
+        events = trace["traceEvents"]
+        self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+        validate = next(e for e in events if e["name"] == "validate")
+        self.assertEqual(validate["args"], {"input": "a.json", "valid": False})
+        self.assertEqual(sum(e["cat"] == "file" for e in events), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
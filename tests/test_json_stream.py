@@ -0,0 +1,101 @@
+import io
+import json
+import random
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from json_stream import JSONTokenReader  # noqa: E402
+
+SCALARS = [0, -1, 7, 1.5, -0.0, 12.25, 1e-07, -3.5e+20, 123456789, True, False, None,
+           "", "plain", "esc \"quoted\" \\ \n", "unicode é ሴ 😀"]
+
+
+def make_document(rng, depth=0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.4:
+        return rng.choice(SCALARS)
+    if roll < 0.7:
+        return [make_document(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"key-{i}": make_document(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def read_all(text, chunk_size):
+    reader = JSONTokenReader(io.StringIO(text), chunk_size)
+    value = reader.read_value(reader.next_token())
+    if reader.next_token()[0] != "eof":
+        raise AssertionError("trailing data")
+    return value
+
+
+class TrackingReader(JSONTokenReader):
+    """Records the largest buffer the reader ever holds."""
+
+    peak = 0
+
+    def _fill(self, size=0):
+        super()._fill(size)
+        self.peak = max(self.peak, len(self.buf))
+
+
+class JSONTokenReaderTests(unittest.TestCase):
+    def test_small_chunks_match_json_loads(self):
+        rng = random.Random(0)
+        documents = [make_document(rng) for _ in range(300)] + SCALARS
+        for doc in documents:
+            for text in (json.dumps(doc), json.dumps(doc, indent=1, ensure_ascii=False)):
+                expected = json.dumps(json.loads(text))
+                for chunk_size in range(1, 8):
+                    with self.subTest(text=text, chunk_size=chunk_size):
+                        self.assertEqual(json.dumps(read_all(text, chunk_size)), expected)
+
+    def test_number_split_across_chunks(self):
+        for text in ("1.5", "-0.0", "1e5", "1e-5", "[2.25E+3]", '{"x": 10.75}'):
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(repr(read_all(text, chunk_size)), repr(json.loads(text)))
+
+    def test_truncated_number_is_an_error(self):
+        for text in ("1.", "1e", "[1e-]"):
+            with self.subTest(text=text), self.assertRaises(json.JSONDecodeError):
+                read_all(text, 1)
+
+    def test_long_string_is_read_and_skipped_in_bounded_buffers(self):
+        chunk_size = 4096
+        long_value = ("abc\\\"\u00e9\n" * 300000) + "end"  # ~2.4 MB
+        text = json.dumps({"skip": [long_value], "keep": long_value})
+
+        reader = TrackingReader(io.StringIO(text), chunk_size)
+        self.assertEqual(reader.read_value(reader.next_token()), json.loads(text))
+
+        reader = TrackingReader(io.StringIO(text), chunk_size)
+        reader.expect("{")
+        self.assertEqual(reader.read_key(reader.next_member(False)), "skip")
+        reader.skip_value(reader.next_token())
+        self.assertLessEqual(reader.peak, 2 * chunk_size)
+        self.assertEqual(reader.read_key(reader.next_member(True)), "keep")
+        self.assertEqual(reader.read_value(reader.next_token()), long_value)
+
+    def test_invalid_control_character_fails_fast(self):
+        chunk_size = 4096
+        text = '{"a": "x\ny' + "z" * (1 << 20) + '"}'
+        for skip in (False, True):
+            with self.subTest(skip=skip):
+                reader = TrackingReader(io.StringIO(text), chunk_size)
+                reader.expect("{")
+                reader.read_key(reader.next_member(False))
+                with self.assertRaises(json.JSONDecodeError) as cm:
+                    if skip:
+                        reader.skip_value(reader.next_token())
+                    else:
+                        reader.read_value(reader.next_token())
+                self.assertEqual(cm.exception.msg, "Invalid control character at")
+                self.assertLessEqual(reader.peak, 2 * chunk_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import shutil
+import sys
+import tempfile
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA = ROOT / "data" / "project_analysis"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import knowledge_store  # noqa: E402
+from knowledge_store import KnowledgeStore  # noqa: E402
+
+
+class KnowledgeStoreTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.data_dir = Path(cls._tmp.name)
+        for name in ("actions_knowledge.json", "conditions_knowledge.json", "index.json"):
+            shutil.copy(DATA / name, cls.data_dir / name)
+        (cls.data_dir / "cooccurrence_knowledge.json").write_text(json.dumps({
+            "cond_action": {"Keyboard:on-key-pressed": [
+                {"key": "System:wait", "count": 12}, {"key": "Audio:play", "count": 9}]},
+            "parent_child": {},
+        }), encoding='utf-8')
+        with open(DATA / "actions_knowledge.json", 'r', encoding='utf-8') as f:
+            cls.actions = json.load(f)
+        cls.store = KnowledgeStore(cls.data_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.store.close()
+        cls._tmp.cleanup()
+
+    def test_get_matches_json(self):
+        key = "System:create-object"
+        self.assertEqual(self.store.get(key), self.actions[key])
+        self.assertEqual(self.store.param_examples(key), self.actions[key]["param_examples"])
+        self.assertIsNone(self.store.get(key, "conditions"))
+
+    def test_top_matches_json_order(self):
+        expected = [(k, v) for k, v in self.actions.items() if v["objectClass"] == "Player"][:5]
+        self.assertEqual(self.store.top("actions", object_class="Player", limit=5), expected)
+        self.assertEqual(self.store.index()["top_10_actions"], list(self.actions)[:10])
+
+    def test_neighbours(self):
+        self.assertEqual(self.store.neighbours("Keyboard:on-key-pressed", limit=1), [("System:wait", 12)])
+        self.assertEqual(self.store.neighbours("Keyboard:on-key-pressed", "parent_child"), [])
+
+    def test_rebuild_uses_private_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            for name in ("actions_knowledge.json", "conditions_knowledge.json", "index.json"):
+                shutil.copy(self.data_dir / name, data_dir / name)
+            # Another process's in-progress rebuild must be left alone
+            other = data_dir / "knowledge.db.tmp"
+            other.write_bytes(b"partial")
+
+            knowledge_store.build_from_json(data_dir)
+            self.assertEqual(other.read_bytes(), b"partial")
+            self.assertEqual(sorted(p.name for p in data_dir.glob("knowledge.db*")),
+                             ["knowledge.db", "knowledge.db.tmp"])
+
+            # A stale store that cannot be rebuilt is still served
+            source = data_dir / "actions_knowledge.json"
+            st = source.stat()
+            os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 10))
+            with mock.patch.object(knowledge_store, "build_from_json",
+                                   side_effect=PermissionError("read-only")) as rebuild, \
+                    mock.patch("sys.stderr"):
+                with KnowledgeStore(data_dir) as store:
+                    self.assertEqual(store.get("System:create-object"),
+                                     self.actions["System:create-object"])
+            rebuild.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
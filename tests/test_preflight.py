@@ -0,0 +1,145 @@
+import importlib.util
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+PREFLIGHT = ROOT / "scripts" / "preflight.py"
+STUBS = Path(__file__).resolve().parent / "stubs"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+VALID = json.dumps({"is-c3-clipboard-data": True, "type": "events", "items": [{}]})
+INVALID = json.dumps({"type": "events", "items": [{}]})
+
+# Runs preflight.py with the stub validator imported first, so it is used
+# even when the real validate_output.py is installed
+RUNNER = (
+    "import runpy, sys; sys.path[:0] = [{scripts!r}, {stubs!r}]; import validate_output; "
+    "sys.argv = [{script!r}] + sys.argv[1:]; runpy.run_path({script!r}, run_name='__main__')"
+).format(scripts=str(PREFLIGHT.parent), stubs=str(STUBS), script=str(PREFLIGHT))
+
+
+def load_preflight():
+    """Import preflight.py bound to the stub validator, without touching sys.modules' copy."""
+    saved = sys.modules.get("validate_output")
+    sys.path.insert(0, str(STUBS))
+    try:
+        sys.modules.pop("validate_output", None)
+        spec = importlib.util.spec_from_file_location("preflight_with_stub", PREFLIGHT)
+        module = importlib.util.module_from_spec(spec)
+        # Registered so process pool workers can unpickle its functions
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(STUBS))
+        if saved is None:
+            sys.modules.pop("validate_output", None)
+        else:
+            sys.modules["validate_output"] = saved
+    return module
+
+
+def run_preflight(*args, stdin=""):
+    return subprocess.run([sys.executable, "-c", RUNNER, *args], input=stdin,
+                          capture_output=True, text=True, check=False, timeout=60)
+
+
+def results(stdout):
+    return [json.loads(line) for line in stdout.splitlines() if line.strip()]
+
+
+class PreflightTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.preflight = load_preflight()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_bad_inputs_do_not_stop_the_batch(self):
+        validator = self.preflight.new_validator()
+        items = [("list", "[1, 2]"), ("str", '"str"'), ("broken", "{"),
+                 ("missing", FileNotFoundError("missing.json")), ("ok", VALID), ("bad", INVALID)]
+        out = [self.preflight.validate_content(validator, *item) for item in items]
+
+        self.assertEqual([r["valid"] for r in out], [False, False, False, False, True, False])
+        self.assertTrue(out[0]["errors"][0].startswith("Validator error: AttributeError"))
+        self.assertTrue(out[2]["errors"][0].startswith("JSON parse error"))
+        self.assertTrue(out[3]["errors"][0].startswith("Read error"))
+        self.assertEqual(out[4]["errors"], [])
+        self.assertEqual(out[5]["errors"], ["Missing is-c3-clipboard-data"])
+
+    def test_process_pool_matches_in_process(self):
+        items = [(f"item-{i}", VALID if i % 3 else INVALID) for i in range(12)]
+        items.append(("list", "[1, 2]"))
+        serial = self.preflight.validate_payloads(items)
+
+        threshold = self.preflight.POOL_THRESHOLD
+        self.preflight.POOL_THRESHOLD = 4
+        try:
+            pooled = self.preflight.validate_payloads(items, jobs=2)
+        finally:
+            self.preflight.POOL_THRESHOLD = threshold
+
+        self.assertEqual(pooled, serial)
+        self.assertEqual([r["input"] for r in pooled], [label for label, _ in items])
+        self.assertEqual(sum(r["valid"] for r in pooled), 8)
+
+    def test_batch_files(self):
+        good, bad = self.tmp / "good.json", self.tmp / "bad.json"
+        good.write_text(VALID, encoding="utf-8")
+        bad.write_text(INVALID, encoding="utf-8")
+        missing = self.tmp / "missing.json"
+
+        proc = run_preflight("--batch", str(good), str(missing), str(bad))
+        self.assertEqual(proc.returncode, 1, proc.stderr)
+        out = results(proc.stdout)
+        self.assertEqual([r["input"] for r in out], [str(good), str(missing), str(bad)])
+        self.assertEqual([r["valid"] for r in out], [True, False, False])
+        self.assertTrue(out[1]["errors"][0].startswith("Read error"))
+
+        proc = run_preflight("--batch", str(good), str(good))
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_batch_stdin_and_serve(self):
+        stdin = "\n".join([VALID, "[1, 2]", "", INVALID, VALID]) + "\n"
+        for mode in ("--batch", "--serve"):
+            with self.subTest(mode=mode):
+                proc = run_preflight(mode, stdin=stdin)
+                out = results(proc.stdout)
+                self.assertEqual([r["input"] for r in out],
+                                 ["stdin:1", "stdin:2", "stdin:4", "stdin:5"], proc.stderr)
+                self.assertEqual([r["valid"] for r in out], [True, False, False, True])
+                self.assertEqual(out[3]["errors"], [])
+
+    def test_serve_port(self):
+        proc = subprocess.Popen([sys.executable, "-c", RUNNER, "--serve", "--port", "0"],
+                                stderr=subprocess.PIPE, text=True)
+        try:
+            banner = proc.stderr.readline()
+            port = int(banner.rsplit(":", 1)[1])
+            with socket.create_connection(("127.0.0.1", port), timeout=30) as conn:
+                conn.sendall(f"{VALID}\nnot json\n{INVALID}\n".encode("utf-8"))
+                conn.shutdown(socket.SHUT_WR)
+                with conn.makefile("r", encoding="utf-8") as f:
+                    out = results(f.read())
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+            proc.stderr.close()
+
+        self.assertEqual([r["valid"] for r in out], [True, False, False])
+        self.assertTrue(out[1]["errors"][0].startswith("JSON parse error"))
+
+
+if __name__ == "__main__":
+    unittest.main()
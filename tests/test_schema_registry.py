@@ -0,0 +1,45 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMAS = ROOT / "data" / "schemas"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from schema_registry import SchemaRegistry  # noqa: E402
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def test_resolve_matches_schema_files(self):
+        registry = SchemaRegistry()
+        with open(SCHEMAS / "plugins" / "sprite.json", 'r', encoding='utf-8') as f:
+            sprite = json.load(f)
+        expected = next(a for a in sprite["actions"] if a["id"] == "set-animation")
+
+        self.assertEqual(registry.resolve("Sprite", "actions", "set-animation"), expected)
+        self.assertEqual(registry.params("sprite", "actions", "set-animation"), expected["params"])
+        self.assertEqual(registry.params("EightDir", "actions", "stop"), [])
+        self.assertEqual(registry.source_of("EightDir"), "behaviors")
+        self.assertIsNone(registry.resolve("sprite", "actions", "no-such-action"))
+        self.assertIsNone(registry.resolve("NoSuchPlugin", "actions", "stop"))
+        # Only the files that were asked for are loaded
+        self.assertEqual(sorted(registry._addons), ["eightdir", "sprite"])
+
+    def test_script_name_index_and_snapshot(self):
+        registry = SchemaRegistry()
+        matches = registry.by_script_name("SetAnim", "actions")
+        self.assertIn(("sprite", "actions", "set-animation"), [key for key, _ in matches])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "schemas.pickle"
+            registry.save_snapshot(path)
+            restored = SchemaRegistry.from_snapshot(path)
+            self.assertEqual(restored.by_script_name("SetAnim", "actions"), matches)
+            self.assertEqual(len(restored._aces), 2911)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+CSV = ROOT / "source" / "zh-CN_R466.csv"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from translations import Translations, cache_path  # noqa: E402
+
+
+class TranslationsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.csv = Path(cls._tmp.name) / CSV.name
+        shutil.copy(CSV, cls.csv)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def test_exact_and_prefix_lookup(self):
+        strings = Translations.from_csv(self.csv)
+        self.assertEqual(strings.lookup("text.behaviors.eightdir.properties.set-angle.items.interval-90"),
+                         ("90° 间隔", "90° intervals"))
+        self.assertEqual(strings.get("text.plugins.sprite.name"), "Sprite")
+        self.assertIsNone(strings.lookup("text.plugins.sprite"))
+
+        under = strings.prefix("text.plugins.sprite.actions")
+        self.assertEqual(len(under), 135)
+        self.assertTrue(all(k.startswith("text.plugins.sprite.actions.") for k, _, _ in under))
+        self.assertEqual(strings.subtree("text.plugins.sprite.actions.stop-animation")["list-name"],
+                         {"zh": "停止播放", "en": "Stop"})
+        # "sprite" must not match "spritefont"
+        self.assertNotIn("text.plugins.spritefont.name", [k for k, _, _ in strings.prefix("text.plugins.sprite")])
+
+    def test_cache_round_trip(self):
+        parsed = Translations.load(self.csv)
+        self.assertTrue(cache_path(self.csv).exists())
+        cached = Translations.load(self.csv)
+        self.assertEqual((cached.keys, cached.zh, cached.en), (parsed.keys, parsed.zh, parsed.en))
+
+
+if __name__ == "__main__":
+    unittest.main()